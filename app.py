@@ -51,6 +51,23 @@ _ = open_fixture_details
 # This keeps the FRONTEND data fresh. The sidebar toggle controls the BACKEND data.
 st_autorefresh(interval=300000, key="data_refresher")
 
+# === CACHED SIDEBAR STATS ===
+# Sidebar stats change at most once per sync cycle, so reruns share a recent result.
+# (The startup connection test calls db directly, so it always hits the database.)
+STATS_CACHE_TTL_SECONDS = 300
+
+@st.cache_data(ttl=STATS_CACHE_TTL_SECONDS, show_spinner=False)
+def cached_last_updated_time():
+    return db.get_last_updated_time()
+
+@st.cache_data(ttl=STATS_CACHE_TTL_SECONDS, show_spinner=False)
+def cached_match_counts():
+    return db.get_match_counts()
+
+@st.cache_data(ttl=STATS_CACHE_TTL_SECONDS, show_spinner=False)
+def cached_standings_count():
+    return db.count_standings_lists()
+
 # === SAFE SQLALCHEMY IMPORT ===
 try:
     PSYCOPG2_AVAILABLE = True
@@ -1021,7 +1038,7 @@ if is_running:
 else:
     status_placeholder.warning("Live sync is OFF.")
     # FIX 1: Call db.get_last_updated_time() and display it
-    last_update_time = db.get_last_updated_time()
+    last_update_time = cached_last_updated_time()
     if last_update_time:
         # We can re-use the parse_utc_to_gmt1 function we imported from utils
         date_str, time_str = parse_utc_to_gmt1(last_update_time)
@@ -1034,7 +1051,7 @@ else:
 st.sidebar.info("Atom v3")
 
 # --- v1.7: Sidebar Stats (PERFORMANCE FIX) ---
-status_counts = db.get_match_counts() # Renamed later for consistency
+status_counts = cached_match_counts() # Renamed later for consistency
 upcoming_count = status_counts.get("UPCOMING", 0)
 past_count = status_counts.get("PAST", 0) + status_counts.get("OTHER", 0)
 
@@ -1044,7 +1061,7 @@ st.sidebar.markdown(
 **DB Status** - Connection: {'Ready' if st.session_state.get('initialized') else 'Initializing'}
 - Upcoming: {upcoming_count}
 - Past: {past_count}
-- Standings: {db.count_standings_lists()}
+- Standings: {cached_standings_count()}
 """,
     unsafe_allow_html=True,
 )
\ No newline at end of file
@@ -9,13 +9,11 @@
 # - RETAINED: Fixes for NameError and universal LEFT JOINs.
 
 import os
-import json
 import logging
-import psycopg2
 import pytz
 from datetime import datetime, timezone, timedelta
 from psycopg2.pool import ThreadedConnectionPool
-from psycopg2.extras import execute_values, RealDictCursor
+from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 from typing import Optional, Any, List, Dict
 
@@ -318,54 +316,6 @@ def get_filtered_matches(
             db_pool.putconn(conn)
 
 
-# ============ DB MANIPULATION FUNCTIONS (For populator/predictor) ============
-
-def store_predictions_db(conn, predictions_to_store: List[Dict[str, Any]]):
-    """
-    Stores or updates predictions in the database.
-    """
-    if not predictions_to_store:
-        return
-
-    insert_data = []
-    
-    # Local JSON encoder for datetime
-    class DateTimeEncoder(json.JSONEncoder):
-        def default(self, obj):
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            return json.JSONEncoder.default(self, obj)
-
-    for pred in predictions_to_store:
-        # Use 'fixture_id' and 'predictions'
-        fixture_id = pred['fixture_id']
-        prediction_json = json.dumps(pred['predictions'], cls=DateTimeEncoder)
-        generated_at = datetime.now(timezone.utc)
-        insert_data.append((fixture_id, prediction_json, generated_at))
-
-    # Use 'fixture_id' in the query
-    query = """
-    INSERT INTO predictions (fixture_id, prediction_data, generated_at)
-    VALUES (%s, %s::jsonb, %s)
-    ON CONFLICT (fixture_id) DO UPDATE
-    SET
-        prediction_data = EXCLUDED.prediction_data,
-        generated_at = EXCLUDED.generated_at;
-    """
-    try:
-        with conn.cursor() as cur:
-            execute_values(cur, query, insert_data, page_size=100)
-        conn.commit()
-        logging.info(f"Successfully stored/updated {len(predictions_to_store)} predictions.")
-    except psycopg2.Error as e:
-        conn.rollback()
-        logging.error(f"PostgreSQL error during prediction storage: {e}")
-        raise e
-    except Exception as e:
-        conn.rollback()
-        logging.error(f"General error during prediction storage: {e}")
-        raise e
-
 # ============ HELPER FUNCTIONS FOR WIDGETS (JSONB Extraction) ============
 
 def get_h2h_data(prediction_data: dict) -> list:
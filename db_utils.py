@@ -18,11 +18,12 @@ WHAT'S NEW (v1.7 - CRITICAL SCHEMA FIX):
 """
 
 import os
+import io
 import logging
 import psycopg2
 import json
 from psycopg2.pool import ThreadedConnectionPool
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from dotenv import load_dotenv
 from typing import Optional, Any, List, Dict, Tuple
 from datetime import datetime, timezone
@@ -33,11 +34,13 @@ load_dotenv()
 # ============ UTILITY CONSTANTS ============
 MAX_RETRIES = 3
 RETRY_SLEEP_SECONDS = 5
+EXECUTE_VALUES_PAGE_SIZE = 1000 # Rows per INSERT ... VALUES statement (psycopg2 default is 100)
+COPY_MIN_ROWS = 500 # copy_to_staging switches from execute_values to COPY above this many rows
 TIMEOUT_SECONDS = 15
 
 # DB Pool Config
-POOL_MIN = 1
-POOL_MAX = 10 
+POOL_MIN = 2 # Predictor holds a main connection while its worker threads borrow others
+POOL_MAX = int(os.getenv("DB_POOL_MAX", 10)) # sync.check_pool_budget sizes the predictor's workers against this
 
 # Enrichment Config
 ENRICHMENT_COOLDOWN_HOURS = 24
@@ -99,6 +102,9 @@ def init_db_indexes():
         indexes = [
             ("idx_fixtures_date", "CREATE INDEX IF NOT EXISTS idx_fixtures_date ON public.fixtures (date)"),
             ("idx_fixtures_league_id", "CREATE INDEX IF NOT EXISTS idx_fixtures_league_id ON public.fixtures (league_id)"),
+            # Predictor history lookups: team + league, finished matches, newest first
+            ("idx_fixtures_home_history", "CREATE INDEX IF NOT EXISTS idx_fixtures_home_history ON public.fixtures (home_team_id, league_id, timestamp DESC) WHERE status_short = 'FT'"),
+            ("idx_fixtures_away_history", "CREATE INDEX IF NOT EXISTS idx_fixtures_away_history ON public.fixtures (away_team_id, league_id, timestamp DESC) WHERE status_short = 'FT'"),
             ("idx_standings_league_season", "CREATE INDEX IF NOT EXISTS idx_standings_league_season ON public.standings (league_id, season_year, rank)"),
             ("idx_predictions_fixture_id", "CREATE UNIQUE INDEX IF NOT EXISTS idx_predictions_fixture_id ON public.predictions (fixture_id)"),
             ("idx_predictions_data_gin", "CREATE INDEX IF NOT EXISTS idx_predictions_data_gin ON public.predictions USING gin (prediction_data)"),
@@ -173,6 +179,48 @@ def safe_str(value: Optional[Any]) -> Optional[str]:
     except (ValueError, TypeError):
         return None
 
+# ============ BULK LOAD HELPERS ============
+
+# Escapes for PostgreSQL COPY text format (backslash, tab, newline, carriage return)
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+def copy_field(value: Any) -> str:
+    """Renders one value as a COPY text-format field (NULL as \\N, booleans as t/f)."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return str(value).translate(COPY_ESCAPES)
+
+def copy_to_staging(cursor, table: str, columns: List[str], rows) -> str:
+    """
+    Loads rows into a temp staging table shaped like `table` and returns its name.
+    Batches above COPY_MIN_ROWS are streamed with COPY; smaller ones use a single
+    execute_values INSERT, which is cheaper than building a COPY buffer for a few rows.
+    The caller merges with INSERT ... SELECT ... FROM <staging> ON CONFLICT.
+    The staging table is dropped on commit (or replaced by the next call in the same transaction).
+    """
+    staging = f"{table}_staging"
+    column_list = ", ".join(f'"{col}"' for col in columns) # Quoted: fixtures has a "timestamp" column
+    rows = list(rows)
+
+    # Schema-qualified so a permanent table of the same name is never resolved through search_path
+    cursor.execute(f"DROP TABLE IF EXISTS pg_temp.{staging};")
+    cursor.execute(f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {column_list} FROM {table} WITH NO DATA;")
+
+    if len(rows) <= COPY_MIN_ROWS:
+        if rows:
+            execute_values(cursor, f"INSERT INTO {staging} ({column_list}) VALUES %s", rows, page_size=EXECUTE_VALUES_PAGE_SIZE)
+        return staging
+
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(map(copy_field, row)))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {staging} ({column_list}) FROM STDIN", buffer)
+    return staging
+
 # ============ SQL Fetch Functions (Corrected for app compatibility) ============
 
 def get_filtered_matches(
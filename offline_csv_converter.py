@@ -113,11 +113,13 @@ FIXTURE_ID_COUNTER = -1
 LEAGUE_NAME_MAP: Dict[str, int] = {}
 
 # ============ HELPER FUNCTIONS ============
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]") # Compiled once: normalize_name runs for every CSV row
+
 def normalize_name(name: Optional[str]) -> str:
     """Cleans a name for consistent lookups."""
     if not name:
         return "unknown"
-    return re.sub(r"[^a-z0-9]", "", name.lower().strip())
+    return NON_ALNUM_RE.sub("", name.lower().strip())
 
 def safe_int(value: Any, default: Optional[int] = 0) -> Optional[int]:
     """Safely converts value to int, handling invalid cases and empty strings."""
@@ -187,6 +189,9 @@ def get_or_create_league_season(league_id: int, year: int, start_date: str, end_
         }
     SEASONS_SET.add(year)
 
+# Upper bound for 2-digit-year parsing, computed once per run instead of per row
+MAX_PARSED_YEAR = datetime.now().year + 5
+
 def parse_fd_uk_date(date_str: str) -> Optional[datetime]:
     """
     Parses 'dd/mm/yy' or 'dd/mm/YYYY' formats.
@@ -207,7 +212,7 @@ def parse_fd_uk_date(date_str: str) -> Optional[datetime]:
     try:
         dt = datetime.strptime(date_str, "%d/%m/%y")
         # Add a check to prevent parsing 70s as 2070s in current data range
-        if dt.year > datetime.now().year + 5:
+        if dt.year > MAX_PARSED_YEAR:
              # e.g., if current year is 2025, and %y parsed '70' as 2070, we correct it to 1970
             dt = dt.replace(year=dt.year - 100) 
         return dt
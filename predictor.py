@@ -12,15 +12,17 @@ WHAT'S NEW (v1.17):
 import os 
 import time 
 import logging 
+import threading
 import psycopg2 
 import datetime as dt 
 import json 
 import argparse 
 import sys 
-from psycopg2.extras import execute_values, RealDictCursor
+from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
 
 # Import database utilities (db_utils must be in the same directory)
 import db_utils
@@ -39,12 +41,32 @@ class DateTimeEncoder(json.JSONEncoder):
             return obj.isoformat()
         return json.JSONEncoder.default(self, obj)
 
+# Conditional import for orjson (faster encode of the prediction JSON; datetimes are handled natively)
+try:
+    import orjson
+
+    def dumps_prediction(obj: Dict[str, Any]) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    def dumps_prediction(obj: Dict[str, Any]) -> str:
+        return json.dumps(obj, cls=DateTimeEncoder)
+
 # --- Config ---
 VERSION = "v1.17"
 PREDICTION_DAYS_AHEAD = 14
 CURRENT_DATE = dt.datetime.now(tz=timezone.utc)
 TEN_YEARS_AGO = CURRENT_DATE - timedelta(days=365 * 10)
 BATCH_COMMIT_SIZE = 100 # v1.16: Commit every 100 predictions
+HIGH_TIER_POINTS = 60
+MID_TIER_POINTS = 40
+PREDICTOR_MAX_WORKERS = int(os.getenv("PREDICTOR_MAX_WORKERS", 4)) # Default; sync.py passes a count capped to its pool budget
+
+PREDICTION_COLUMNS = ['fixture_id', 'prediction_data', 'generated_at']
+
+# Per-thread connections for the prediction worker pool (see worker_connection)
+_worker_state = threading.local()
+_worker_conns: List[Any] = []
+_worker_conns_lock = threading.Lock()
 
 # Tag mapping for generating full tag strings from prediction codes
 TAG_MAP = { 
@@ -65,6 +87,10 @@ TAG_MAP = {
     "T/B": "Top vs Bottom", 
     "Rival": "Close Rivals", 
 }
+TAG_ITEMS = tuple(TAG_MAP.items())
+
+# Fields the UI widgets read from the h2h / last7 lists (see widgets.display_*_fixture_list)
+UI_MATCH_KEYS = ('date', 'home_team', 'away_team', 'home_goals', 'away_goals', 'league_id')
 
 # ============ DB UTILITIES ============
 
@@ -84,8 +110,9 @@ def get_fixtures_to_predict(conn, fixture_ids: Optional[List[int]]) -> List[Dict
     
     if fixture_ids:
         # Use fixture_ids provided by sync.py trigger
-        query_condition = "f.fixture_id IN %s"
-        query_params.append(tuple(fixture_ids))
+        # ANY(array) keeps the statement text identical regardless of how many IDs are sent
+        query_condition = "f.fixture_id = ANY(%s)"
+        query_params.append(list(fixture_ids))
         logging.info(f"Running targeted scan for {len(fixture_ids)} fixture IDs.")
     else:
         # Run full scan for all relevant upcoming matches
@@ -125,10 +152,11 @@ def get_fixtures_to_predict(conn, fixture_ids: Optional[List[int]]) -> List[Dict
     cursor.close()
     return rows
 
-def get_standings(conn, league_id: int) -> Dict[int, int]: 
+def get_standings(conn, league_id: int) -> Tuple[Dict[int, int], Dict[int, str]]: 
     """ 
     Fetches current points for teams in the league from the latest season_year. 
-    Returns {team_id: points}. 
+    Tiers are computed in the same query using the HIGH_TIER_POINTS/MID_TIER_POINTS thresholds.
+    Returns ({team_id: points}, {team_id: tier}). 
     """ 
     cursor = conn.cursor(cursor_factory=RealDictCursor) 
     query = """ 
@@ -137,15 +165,24 @@ def get_standings(conn, league_id: int) -> Dict[int, int]:
             FROM standings 
             WHERE league_id = %s 
         ) 
-        SELECT s.team_id, s.points 
+        SELECT 
+            s.team_id, 
+            COALESCE(s.points, 0) AS points,
+            CASE 
+                WHEN s.points >= %s THEN 'high' 
+                WHEN s.points >= %s THEN 'mid' 
+                ELSE 'low' 
+            END AS tier
         FROM standings s 
         JOIN latest_season ls ON s.season_year = ls.max_year 
         WHERE s.league_id = %s
     """ 
-    cursor.execute(query, (league_id, league_id)) 
+    cursor.execute(query, (league_id, HIGH_TIER_POINTS, MID_TIER_POINTS, league_id)) 
     rows = cursor.fetchall() 
     cursor.close() 
-    return {row['team_id']: row['points'] for row in rows} if rows else {}
+    points = {row['team_id']: row['points'] for row in rows}
+    tiers = {row['team_id']: row['tier'] for row in rows}
+    return points, tiers
 
 def get_historical_matches(conn, team_id: int, league_id: int, ten_years_ago: dt.datetime, limit: int = 10) -> List[Dict[str, Any]]: 
     """ 
@@ -159,9 +196,16 @@ def get_historical_matches(conn, team_id: int, league_id: int, ten_years_ago: dt
             f.away_team_id, 
             f.goals_home, 
             f.goals_away, 
-            f.status_short 
+            f.status_short,
+            f.league_id,
+            ht.name AS home_team_name,
+            at.name AS away_team_name
         FROM 
             fixtures f 
+        LEFT JOIN 
+            teams ht ON f.home_team_id = ht.team_id 
+        LEFT JOIN 
+            teams at ON f.away_team_id = at.team_id 
         WHERE 
             (f.home_team_id = %s OR f.away_team_id = %s) 
             AND f.status_short = 'FT' 
@@ -186,6 +230,7 @@ def get_h2h_matches_all(conn, team_a_id: int, team_b_id: int, ten_years_ago: dt.
             f.date, 
             f.goals_home, 
             f.goals_away, 
+            f.league_id,
             ht.name AS home_team_name, 
             at.name AS away_team_name 
         FROM 
@@ -242,66 +287,17 @@ def get_h2h_matches_venue(conn, team_a_id: int, team_b_id: int, is_home: bool, l
     cursor.close() 
     return matches
 
-def get_similar_tier_matches(conn, team_a_id: int, opponents_in_tier: List[int], team_b_id: int, is_home: bool, league_id: int, ten_years_ago: dt.datetime) -> List[Dict[str, Any]]: 
-    """ 
-    Fetches matches against similar-tier opponents (excluding self-matchup), with home/away context, filtered to same league. 
-    """ 
-    if not opponents_in_tier: 
-        return [] 
-        
-    cursor = conn.cursor(cursor_factory=RealDictCursor) 
-    
-    # We use a tuple for the IN clause
-    opponents_tuple = tuple(opponents_in_tier)
-    
-    if is_home: 
-        query = """ 
-            SELECT 
-                f.date, f.home_team_id, f.away_team_id, f.goals_home, f.goals_away 
-            FROM 
-                fixtures f 
-            WHERE 
-                f.home_team_id = %s 
-                AND f.away_team_id IN %s 
-                AND f.away_team_id != %s 
-                AND f.status_short = 'FT' 
-                AND f.league_id = %s 
-                AND f.date >= %s 
-            ORDER BY 
-                f.timestamp DESC
-        """ 
-        cursor.execute(query, (team_a_id, opponents_tuple, team_b_id, league_id, ten_years_ago)) 
-    else: 
-        query = """ 
-            SELECT 
-                f.date, f.home_team_id, f.away_team_id, f.goals_home, f.goals_away 
-            FROM 
-                fixtures f 
-            WHERE 
-                f.away_team_id = %s 
-                AND f.home_team_id IN %s 
-                AND f.home_team_id != %s 
-                AND f.status_short = 'FT' 
-                AND f.league_id = %s 
-                AND f.date >= %s 
-            ORDER BY 
-                f.timestamp DESC
-        """ 
-        cursor.execute(query, (team_a_id, opponents_tuple, team_b_id, league_id, ten_years_ago)) 
-        
-    matches = cursor.fetchall() 
-    cursor.close() 
-    return matches
-
-def get_overall_matches(conn, team_a_id: int, team_b_id: int, is_home: bool, league_id: int, ten_years_ago: dt.datetime) -> List[Dict[str, Any]]: 
+def get_overall_goal_totals(conn, team_a_id: int, team_b_id: int, is_home: bool, league_id: int, ten_years_ago: dt.datetime) -> Tuple[int, int, int]: 
     """ 
-    Fetches all contextual (home/away) matches excluding self-matchup, filtered to same league. 
+    Aggregates all contextual (home/away) matches excluding self-matchup, filtered to same league. 
+    Returns (played, goals_scored, goals_conceded) from team_a's perspective. 
+    The 10-year history is summed in SQL, so no per-match rows are transferred. 
     """ 
-    cursor = conn.cursor(cursor_factory=RealDictCursor) 
+    cursor = conn.cursor() 
     if is_home: 
         query = """ 
             SELECT 
-                f.date, f.home_team_id, f.away_team_id, f.goals_home, f.goals_away 
+                COUNT(*), COALESCE(SUM(f.goals_home), 0), COALESCE(SUM(f.goals_away), 0) 
             FROM 
                 fixtures f 
             WHERE 
@@ -310,14 +306,11 @@ def get_overall_matches(conn, team_a_id: int, team_b_id: int, is_home: bool, lea
                 AND f.status_short = 'FT' 
                 AND f.league_id = %s 
                 AND f.date >= %s 
-            ORDER BY 
-                f.timestamp DESC
         """ 
-        cursor.execute(query, (team_a_id, team_b_id, league_id, ten_years_ago)) 
     else: 
         query = """ 
             SELECT 
-                f.date, f.home_team_id, f.away_team_id, f.goals_home, f.goals_away 
+                COUNT(*), COALESCE(SUM(f.goals_away), 0), COALESCE(SUM(f.goals_home), 0) 
             FROM 
                 fixtures f 
             WHERE 
@@ -326,14 +319,11 @@ def get_overall_matches(conn, team_a_id: int, team_b_id: int, is_home: bool, lea
                 AND f.status_short = 'FT' 
                 AND f.league_id = %s 
                 AND f.date >= %s 
-            ORDER BY 
-                f.timestamp DESC
         """ 
-        cursor.execute(query, (team_a_id, team_b_id, league_id, ten_years_ago)) 
-        
-    matches = cursor.fetchall() 
+    cursor.execute(query, (team_a_id, team_b_id, league_id, ten_years_ago)) 
+    played, goals_scored, goals_conceded = cursor.fetchone() 
     cursor.close() 
-    return matches
+    return played, int(goals_scored), int(goals_conceded)
 
 def store_predictions_db(conn, predictions_list: List[Dict[str, Any]]): 
     """ 
@@ -344,79 +334,66 @@ def store_predictions_db(conn, predictions_list: List[Dict[str, Any]]):
         logging.info("No predictions generated to store.") 
         return
         
-    cursor = conn.cursor() 
-    data_to_insert = [] 
-    current_time = CURRENT_DATE 
-    
-    for pred in predictions_list: 
-        # v1.17: Store fixture_id, prediction_data (JSON), generated_at
-        data_to_insert.append(( 
-            pred['fixture_id'], 
-            json.dumps(pred['predictions'], cls=DateTimeEncoder), 
-            current_time 
-        ))
-
-    insert_sql = """
-        INSERT INTO predictions (fixture_id, prediction_data, generated_at)
-        VALUES %s
-        ON CONFLICT (fixture_id) DO UPDATE SET
-            prediction_data = EXCLUDED.prediction_data,
-            generated_at = EXCLUDED.generated_at;
-    """
-    
+    cursor = conn.cursor()
+    current_time = CURRENT_DATE.isoformat()
+
+    # v1.17: Store fixture_id, prediction_data (JSON), generated_at
+    rows = (
+        (pred['fixture_id'], dumps_prediction(pred['predictions']), current_time)
+        for pred in predictions_list
+    )
+
     try:
-        execute_values(cursor, insert_sql, data_to_insert)
+        # Stage the batch, then merge in one statement. Batches of BATCH_COMMIT_SIZE stay under
+        # db_utils.COPY_MIN_ROWS, so copy_to_staging loads them with a single execute_values INSERT.
+        staging = db_utils.copy_to_staging(cursor, "predictions", PREDICTION_COLUMNS, rows)
+        cursor.execute(f"""
+            INSERT INTO predictions (fixture_id, prediction_data, generated_at)
+            SELECT fixture_id, prediction_data, generated_at FROM {staging}
+            ON CONFLICT (fixture_id) DO UPDATE SET
+                prediction_data = EXCLUDED.prediction_data,
+                generated_at = EXCLUDED.generated_at;
+        """)
         conn.commit()
-        logging.info(f"Successfully stored/updated {len(predictions_list)} predictions.")
+        logging.debug(f"Successfully stored/updated {len(predictions_list)} predictions.")
     except Exception as e:
         conn.rollback()
         logging.error(f"Failed to store predictions: {e}")
         raise # Re-raise the exception to stop the main process if a critical DB error occurs
+    finally:
+        cursor.close()
 
 
 # ============ PREDICTION LOGIC (Updated Rule-Based) ============
 
-def get_tier(points: int) -> str: 
-    """ Computes team tier based on current points. """ 
-    if points >= 60: 
-        return 'high' 
-    elif points >= 40: 
-        return 'mid' 
-    else: 
-        return 'low'
-
-def is_win(match: Dict[str, Any], team_id: int) -> bool: 
-    goals_scored = get_team_goals(match, team_id) 
-    goals_conceded = get_team_conceded(match, team_id) 
-    return goals_scored > goals_conceded
-
-def is_draw(match: Dict[str, Any], team_id: int) -> bool: 
-    goals_scored = get_team_goals(match, team_id) 
-    goals_conceded = get_team_conceded(match, team_id) 
-    return goals_scored == goals_conceded
-
-def is_loss(match: Dict[str, Any], team_id: int) -> bool: 
-    goals_scored = get_team_goals(match, team_id) 
-    goals_conceded = get_team_conceded(match, team_id) 
-    return goals_scored < goals_conceded
-
-def get_team_goals(match: Dict[str, Any], team_id: int) -> int: 
-    if match['home_team_id'] == team_id: 
-        return match['goals_home'] or 0 
-    elif match['away_team_id'] == team_id: 
-        return match['goals_away'] or 0 
-    return 0
+def score_line(match: Dict[str, Any], team_id: int) -> Tuple[int, int, int]:
+    """ Returns (goals_scored, goals_conceded, opponent_id) for team_id in one lookup. """
+    if match['home_team_id'] == team_id:
+        return match['goals_home'] or 0, match['goals_away'] or 0, match['away_team_id']
+    return match['goals_away'] or 0, match['goals_home'] or 0, match['home_team_id']
 
-def get_team_conceded(match: Dict[str, Any], team_id: int) -> int: 
-    return get_team_goals(match, opponent_of(match, team_id))
-
-def opponent_of(match: Dict[str, Any], team_id: int) -> int: 
-    return match['away_team_id'] if match['home_team_id'] == team_id else match['home_team_id']
-
-def get_opponent_tier(match: Dict[str, Any], team_id: int, standings: Dict[int, int]) -> str: 
-    opp_id = opponent_of(match, team_id) 
-    points = standings.get(opp_id, 0) 
-    return get_tier(points)
+def tally_matches(matches: List[Dict[str, Any]], team_id: int) -> Tuple[int, int, int, int, int]:
+    """
+    Single pass over a match list returning (wins, draws, losses, goals_for, goals_against)
+    from the perspective of team_id. Replaces the per-metric generator sums.
+    """
+    wins = draws = losses = goals_for = goals_against = 0
+    for match in matches:
+        if match['home_team_id'] == team_id:
+            scored = match['goals_home'] or 0
+            conceded = match['goals_away'] or 0
+        else:
+            scored = match['goals_away'] or 0
+            conceded = match['goals_home'] or 0
+        goals_for += scored
+        goals_against += conceded
+        if scored > conceded:
+            wins += 1
+        elif scored == conceded:
+            draws += 1
+        else:
+            losses += 1
+    return wins, draws, losses, goals_for, goals_against
 
 def predict_for_team( 
     conn, 
@@ -424,11 +401,13 @@ def predict_for_team(
     team_b_id: int, 
     is_home: bool, 
     league_id: int, 
-    standings: Dict[int, int] 
+    standings: Dict[int, int],
+    tiers: Dict[int, str],
+    form_cache: Optional[Dict[Tuple[int, int], List[Dict[str, Any]]]] = None
 ) -> Dict[str, bool]: 
     """ Generates predictions for a single team using the updated algorithm. """ 
-    tier_a = get_tier(standings.get(team_a_id, 0)) 
-    tier_b = get_tier(standings.get(team_b_id, 0))
+    tier_a = tiers.get(team_a_id, 'low')
+    tier_b = tiers.get(team_b_id, 'low')
     
     # --- 1. Rule-Based Attributes (T/B, Rival) ---
     attributes = { 
@@ -438,50 +417,44 @@ def predict_for_team(
 
     # --- 2. Historical Data Fetch ---
     # Last 7 for Recent Form visualization
-    last_7_matches = get_historical_matches(conn, team_a_id, league_id, TEN_YEARS_AGO, limit=7)
+    # (a team usually has several upcoming fixtures, so reuse its form across the run)
+    form_key = (team_a_id, league_id)
+    if form_cache is not None and form_key in form_cache:
+        last_7_matches = form_cache[form_key]
+    else:
+        last_7_matches = get_historical_matches(conn, team_a_id, league_id, TEN_YEARS_AGO, limit=7)
+        if form_cache is not None:
+            form_cache[form_key] = last_7_matches
     
-    # Overall matches in context (home/away, excluding this opponent)
-    overall_context_matches = get_overall_matches(conn, team_a_id, team_b_id, is_home, league_id, TEN_YEARS_AGO)
+    # Overall goal totals in context (home/away, excluding this opponent)
+    overall_played, overall_goals_scored, overall_goals_conceded = get_overall_goal_totals(conn, team_a_id, team_b_id, is_home, league_id, TEN_YEARS_AGO)
     
     # H2H matches in context (venue-specific)
     h2h_context_matches = get_h2h_matches_venue(conn, team_a_id, team_b_id, is_home, league_id, TEN_YEARS_AGO)
 
-    # Similar tier opponents (for W/L analysis)
-    all_teams_in_league = list(standings.keys())
-    opponents_in_tier = [
-        tid for tid in all_teams_in_league 
-        if get_tier(standings.get(tid, 0)) == tier_b
-    ]
-    similar_tier_matches = get_similar_tier_matches(conn, team_a_id, opponents_in_tier, team_b_id, is_home, league_id, TEN_YEARS_AGO)
-
     # --- 3. Compute Metrics ---
     
     # Win/Loss/Draw Count
-    recent_wins = sum(1 for match in last_7_matches if is_win(match, team_a_id))
-    recent_draws = sum(1 for match in last_7_matches if is_draw(match, team_a_id))
-    
+    recent_wins, recent_draws, _, _, _ = tally_matches(last_7_matches, team_a_id)
+
     # Goal Metrics (Overall Contextual)
-    overall_goals_scored = sum(get_team_goals(match, team_a_id) for match in overall_context_matches)
-    overall_goals_conceded = sum(get_team_conceded(match, team_a_id) for match in overall_context_matches)
-    overall_played = len(overall_context_matches) or 1
+    overall_played = overall_played or 1
     
     avg_scored = overall_goals_scored / overall_played
     avg_conceded = overall_goals_conceded / overall_played
     
     # Strength/Weakness vs Tier (for BST/LWT)
-    high_tier_matches = [
-        match for match in last_7_matches if get_opponent_tier(match, team_a_id, standings) == 'high'
-    ]
-    low_tier_matches = [
-        match for match in last_7_matches if get_opponent_tier(match, team_a_id, standings) == 'low'
-    ]
-    
-    high_tier_wins = sum(1 for match in high_tier_matches if is_win(match, team_a_id))
-    low_tier_losses = sum(1 for match in low_tier_matches if is_loss(match, team_a_id))
-    
+    high_tier_wins = low_tier_losses = 0
+    for match in last_7_matches:
+        scored, conceded, opponent_id = score_line(match, team_a_id)
+        opponent_tier = tiers.get(opponent_id, 'low')
+        if opponent_tier == 'high' and scored > conceded:
+            high_tier_wins += 1
+        elif opponent_tier == 'low' and scored < conceded:
+            low_tier_losses += 1
+
     # H2H Dominance Check
-    h2h_wins = sum(1 for match in h2h_context_matches if is_win(match, team_a_id))
-    h2h_losses = sum(1 for match in h2h_context_matches if is_loss(match, team_a_id))
+    h2h_wins, _, h2h_losses, _, _ = tally_matches(h2h_context_matches, team_a_id)
     
     # --- 4. Generate Predictions (True/False) ---
     predictions = {
@@ -509,55 +482,77 @@ def predict_for_team(
         "Rival": attributes['Rival'],
     }
     
-    # Package data for UI
+    # Package data for UI (prediction flags plus raw data)
     ui_data = {
-        'W': predictions['W'], 'D': predictions['D'], 'L': predictions['L'],
-        'S1+': predictions['S1+'], 'S2+': predictions['S2+'], 'S3+': predictions['S3+'],
-        'CS': predictions['CS'], 'C1+': predictions['C1+'], 'C2+': predictions['C2+'], 'C3+': predictions['C3+'],
-        'BST': predictions['BST'], 'LWT': predictions['LWT'], 'H2H': predictions['H2H'],
-        'T/B': predictions['T/B'], 'Rival': predictions['Rival'],
+        **predictions,
         
         # Raw data for UI visualization
-        'last7': last_7_matches,
+        'last7': [to_ui_match(match) for match in last_7_matches],
         'avg_scored': round(avg_scored, 2),
         'avg_conceded': round(avg_conceded, 2),
     }
 
     return ui_data
 
+def to_ui_match(match: Dict[str, Any]) -> Dict[str, Any]:
+    """ Projects a fixture row onto the compact UI_MATCH_KEYS shape stored in the prediction JSONB. """
+    match_date = match['date']
+    if isinstance(match_date, dt.datetime):
+        match_date = match_date.strftime('%Y-%m-%d %H:%M:%S')
+    return dict(zip(UI_MATCH_KEYS, (
+        match_date,
+        match['home_team_name'],
+        match['away_team_name'],
+        match['goals_home'],
+        match['goals_away'],
+        match['league_id'],
+    )))
+
 def generate_tags(predictions: Dict[str, bool]) -> List[str]: 
     """ Converts True predictions to full tag strings using TAG_MAP. """ 
-    tags = [] 
-    for code, full_tag in TAG_MAP.items(): 
-        # Check against both rule-based and attribute keys
-        if predictions.get(code, False) or predictions.get(code.lower(), False):
-            tags.append(full_tag) 
-    return tags
-
-def run_prediction(conn, match: Dict[str, Any]) -> Dict[str, Any]: 
+    # predict_for_team emits the TAG_MAP codes verbatim, so one lookup per code is enough
+    return [full_tag for code, full_tag in TAG_ITEMS if predictions.get(code, False)]
+
+def new_run_cache() -> Dict[str, Dict]:
+    """ Empty per-run memo: standings by league, recent form by (team, league), H2H by team pair. """
+    return {'standings': {}, 'form': {}, 'h2h': {}}
+
+def run_prediction(conn, match: Dict[str, Any], run_cache: Optional[Dict[str, Dict]] = None) -> Dict[str, Any]: 
     """ 
     Generates predictions and packages data for one match using the updated algorithm. 
+    `run_cache` (see new_run_cache) memoizes standings, recent form and H2H lists across
+    the fixtures of a single predictor run.
     """ 
+    if run_cache is None:
+        run_cache = new_run_cache()
+
     home_id = match['home_team_id'] 
     away_id = match['away_team_id'] 
     league_id = match['league_id']
     
-    # Fetch standings (only once per match)
-    standings = get_standings(conn, league_id)
+    # Fetch standings (only once per league per run)
+    if league_id not in run_cache['standings']:
+        league_standings, league_tiers = get_standings(conn, league_id)
+        run_cache['standings'][league_id] = (league_standings, league_tiers)
+    standings, tiers = run_cache['standings'][league_id]
 
     # 1. Predict for Home Team
-    home_pred_raw = predict_for_team(conn, home_id, away_id, is_home=True, league_id=league_id, standings=standings)
+    home_pred_raw = predict_for_team(conn, home_id, away_id, is_home=True, league_id=league_id, standings=standings, tiers=tiers, form_cache=run_cache['form'])
     
     # 2. Predict for Away Team
-    away_pred_raw = predict_for_team(conn, away_id, home_id, is_home=False, league_id=league_id, standings=standings)
+    away_pred_raw = predict_for_team(conn, away_id, home_id, is_home=False, league_id=league_id, standings=standings, tiers=tiers, form_cache=run_cache['form'])
     
     # 3. Fetch H2H for UI visualization (All venues)
-    h2h_ui_data = get_h2h_matches_all(conn, home_id, away_id, TEN_YEARS_AGO, limit=10)
+    # (H2H is symmetrical, so the pair is cached regardless of venue)
+    h2h_key = frozenset((home_id, away_id))
+    if h2h_key not in run_cache['h2h']:
+        run_cache['h2h'][h2h_key] = get_h2h_matches_all(conn, home_id, away_id, TEN_YEARS_AGO, limit=10)
+    h2h_ui_data = run_cache['h2h'][h2h_key]
 
     # 4. Package final JSONB structure (v1.17)
     final_prediction_json = {
         # Visualization data
-        "h2h": h2h_ui_data,
+        "h2h": [to_ui_match(match) for match in h2h_ui_data],
         "home_last7": home_pred_raw['last7'],
         "away_last7": away_pred_raw['last7'],
         
@@ -591,71 +586,140 @@ def run_prediction(conn, match: Dict[str, Any]) -> Dict[str, Any]:
 
 # ============ MAIN EXECUTION ============
 
-def main(): 
-    parser = argparse.ArgumentParser(description="Rule-Based Football Predictor.") 
-    parser.add_argument("--fixtures", type=str, default=None, help="Comma-separated list of fixture_ids to predict.") 
-    args = parser.parse_args()
-    
-    # Process fixture IDs from argument
-    fixture_ids_to_predict: Optional[List[int]] = None
-    if args.fixtures:
+def worker_connection():
+    """
+    Returns the calling worker thread's connection, checking one out of the pool on first use.
+    Workers keep it for the whole run; main returns them via release_worker_connections.
+    """
+    conn = getattr(_worker_state, 'conn', None)
+    if conn is None:
+        conn = db_utils.get_connection()
+        if conn is None:
+            return None
+        _worker_state.conn = conn
+        with _worker_conns_lock:
+            _worker_conns.append(conn)
+    return conn
+
+def release_worker_connections():
+    """ Returns every worker thread's connection to the pool (after the executor has shut down). """
+    with _worker_conns_lock:
+        for conn in _worker_conns:
+            db_utils.release_connection(conn)
+        _worker_conns.clear()
+
+def predict_fixture(match: Dict[str, Any], run_cache: Dict[str, Dict]) -> Optional[Dict[str, Any]]:
+    """
+    Thread-pool entry point: predicts one fixture on the worker's long-lived connection.
+    Returns None (after logging) if the fixture could not be processed.
+    """
+    conn = worker_connection()
+    if conn is None:
+        logging.error(f"Failed to process fixture {match['fixture_id']}: no database connection available.")
+        return None
+    try:
+        return run_prediction(conn, match, run_cache)
+    except Exception as e:
+        logging.error(f"Failed to process fixture {match['fixture_id']}: {e}")
+        # Continue to next fixture, preserving the overall batch integrity
+        return None
+    finally:
+        # Reads only: end the implicit transaction so the connection is not left idle in transaction
         try:
-            fixture_ids_to_predict = [int(x.strip()) for x in args.fixtures.split(',') if x.strip()]
-        except ValueError:
-            logging.error("Invalid fixture ID list provided. Aborting.")
-            sys.exit(1)
-            
+            conn.rollback()
+        except psycopg2.Error as e:
+            logging.warning(f"Could not reset worker connection after fixture {match['fixture_id']}: {e}")
+
+def run(fixture_ids: Optional[List[int]] = None, max_workers: Optional[int] = None) -> int:
+    """
+    Predicts the given fixtures (or every pending fixture when None) and stores the results.
+    Callable in-process (sync.py does this, passing max_workers sized to its pool budget);
+    the DB pool is initialized on first use.
+    Returns the number of predictions generated; a failed run is logged and re-raised
+    so in-process callers can retry it.
+    """
+    global CURRENT_DATE, TEN_YEARS_AGO
+    # Long-lived callers run many times per process, so the reference dates are taken per run
+    CURRENT_DATE = dt.datetime.now(tz=timezone.utc)
+    TEN_YEARS_AGO = CURRENT_DATE - timedelta(days=365 * 10)
+
+    generated_count = 0
     conn = None 
     try: 
         db_utils.init_connection_pool() 
         conn = db_utils.get_connection()
 
         if conn is None:
-            logging.error("Failed to acquire database connection.")
-            sys.exit(1)
+            raise RuntimeError("Failed to acquire database connection.")
             
         # 1. Fetch matches requiring prediction
-        matches_to_predict = get_fixtures_to_predict(conn, fixture_ids_to_predict)
+        matches_to_predict = get_fixtures_to_predict(conn, fixture_ids)
         
         if not matches_to_predict:
             logging.info("No fixtures found requiring prediction/update.")
-            return
+            return 0
 
         logging.info(f"Predictor {VERSION} found {len(matches_to_predict)} fixtures to predict.")
 
         # 2. Run prediction cycle
         all_predictions_to_store: List[Dict[str, Any]] = []
+        run_cache = new_run_cache()
+        t0 = time.time()
         
-        for i, match in enumerate(matches_to_predict):
-            try:
-                prediction_data = run_prediction(conn, match)
-                all_predictions_to_store.append(prediction_data)
-                
+        # Fixtures are independent and DB-bound, so they are predicted on a thread pool
+        # (each worker keeps one pooled connection for the run); results are saved from this thread.
+        with ThreadPoolExecutor(max_workers=max_workers or PREDICTOR_MAX_WORKERS, thread_name_prefix="Predictor") as executor:
+            results = executor.map(lambda m: predict_fixture(m, run_cache), matches_to_predict)
+            for i, prediction_data in enumerate(results):
+                if prediction_data is not None:
+                    all_predictions_to_store.append(prediction_data)
+                    generated_count += 1
+
                 # v1.16: Incremental Save Logic
-                if (i + 1) % BATCH_COMMIT_SIZE == 0:
-                    logging.info(f"Processed {i + 1}/{len(matches_to_predict)} fixtures. Saving batch to database...")
+                if (i + 1) % BATCH_COMMIT_SIZE == 0 and all_predictions_to_store:
+                    logging.debug(f"Processed {i + 1}/{len(matches_to_predict)} fixtures. Saving batch to database...")
                     # Store and immediately clear the buffer
                     store_predictions_db(conn, all_predictions_to_store)
                     all_predictions_to_store = []
-                    
-            except Exception as e:
-                logging.error(f"Failed to process fixture {match['fixture_id']}: {e}")
-                # Continue to next fixture, preserving the overall batch integrity
-                
+
         # 3. Store any remaining predictions in the final batch
         if all_predictions_to_store:
-            logging.info(f"Processing final batch of {len(all_predictions_to_store)} predictions. Saving to database...")
+            logging.debug(f"Processing final batch of {len(all_predictions_to_store)} predictions. Saving to database...")
             store_predictions_db(conn, all_predictions_to_store)
 
+        logging.info(f"Generated predictions for {generated_count}/{len(matches_to_predict)} fixtures in {time.time() - t0:.2f}s")
+
     except Exception as e:
         logging.error(f"Predictor main process failed: {e}")
         if conn:
             conn.rollback() # Ensure rollback on failure
+        raise
     finally:
+        release_worker_connections()
         if conn:
             db_utils.release_connection(conn)
         # Note: db_utils handles closing the pool globally
         
+    return generated_count
+
+def main(): 
+    parser = argparse.ArgumentParser(description="Rule-Based Football Predictor.") 
+    parser.add_argument("--fixtures", type=str, default=None, help="Comma-separated list of fixture_ids to predict.") 
+    args = parser.parse_args()
+    
+    # Process fixture IDs from argument
+    fixture_ids_to_predict: Optional[List[int]] = None
+    if args.fixtures:
+        try:
+            fixture_ids_to_predict = [int(x.strip()) for x in args.fixtures.split(',') if x.strip()]
+        except ValueError:
+            logging.error("Invalid fixture ID list provided. Aborting.")
+            sys.exit(1)
+            
+    try:
+        run(fixture_ids_to_predict)
+    except Exception:
+        sys.exit(1) # Already logged by run()
     logging.info("Predictor script finished.")
 
 
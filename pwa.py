@@ -1,5 +1,6 @@
 # pwa.py v1.0
 import streamlit as st
+from functools import lru_cache
 from pathlib import Path
 
 # Conditional import for Server
@@ -9,13 +10,29 @@ try:
 except ImportError:
     STREAMLIT_SERVER_AVAILABLE = False
 
+PWA_FILES = (
+    ("manifest.json", "application/json"),
+    ("service-worker.js", "application/javascript"),
+    ("static/icon-192.png", "image/png"),
+    ("static/icon-512.png", "image/png"),
+    ("static/style.css", "text/css"),
+)
+_ROUTES_REGISTERED = False
 
+
+@lru_cache(maxsize=None)
 def get_file(path: str) -> bytes:
-    """Reads file content for PWA serving."""
+    """Reads file content for PWA serving (assets don't change while the server runs)."""
     p = Path(__file__).parent / path
     return p.read_bytes() if p.exists() else b""
 
 
+@st.cache_data(show_spinner=False)
+def _serve(file: str, ctype: str):
+    """Returns (content, content_type) for a PWA file route."""
+    return get_file(file), ctype
+
+
 def add_file_route(path: str, content_factory: callable, content_type: str):
     """Adds a file route to the Streamlit server for PWA files."""
     if not STREAMLIT_SERVER_AVAILABLE:
@@ -33,23 +50,13 @@ def add_file_route(path: str, content_factory: callable, content_type: str):
 def inject_pwa():
     """Injects the necessary PWA links and service worker registration script."""
 
-    # Register file routes
-    for file, ctype in [
-        ("manifest.json", "application/json"),
-        ("service-worker.js", "application/javascript"),
-        ("static/icon-192.png", "image/png"),
-        ("static/icon-512.png", "image/png"),
-        ("static/style.css", "text/css"),
-    ]:
-        key = f"serve_{file.replace('/', '_')}"
-        if key not in st.session_state:
+    # Register file routes once per process; the routes live on the server, not the session
+    global _ROUTES_REGISTERED
+    if not _ROUTES_REGISTERED:
+        for file, ctype in PWA_FILES:
             # Use a lambda to capture file and ctype correctly
-            @st.cache_data
-            def serve(f=file, c=ctype):
-                return get_file(f), c
-
-            add_file_route(file, lambda f=file, c=ctype: serve(f, c), ctype)
-            st.session_state[key] = True
+            add_file_route(file, lambda f=file, c=ctype: _serve(f, c), ctype)
+        _ROUTES_REGISTERED = True
 
     # Inject HTML links
     manifest = """
@@ -17,11 +17,17 @@ import aiohttp
 import asyncio
 import datetime as dt
 import json
+import hashlib
 import sys
-import subprocess
+import threading
+import queue
+from logging.handlers import QueueHandler, QueueListener
 import re
 import math
+from collections import deque
+from operator import itemgetter
 from datetime import UTC
+from concurrent.futures import ThreadPoolExecutor
 from psycopg2.extras import execute_values, RealDictCursor
 from dotenv import load_dotenv
 from typing import List, Tuple, Dict, Any, Optional, Set
@@ -29,6 +35,17 @@ from typing import List, Tuple, Dict, Any, Optional, Set
 # Import database utilities
 import db_utils 
 
+# Conditional import for orjson (faster decode of large API payloads and of the payload hash input)
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps_bytes = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
 # ============ CONFIG & LOGGING ============
 load_dotenv()
 logging.basicConfig(
@@ -37,6 +54,9 @@ logging.basicConfig(
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 
+# Imported after logging is configured: predictor's own basicConfig then becomes a no-op
+import predictor
+
 # API Config
 AS_API_KEY = os.getenv("AS_API_KEY")
 AS_FIXTURES_URL = "https://v3.football.api-sports.io/fixtures"
@@ -46,9 +66,25 @@ AS_STANDINGS_URL = "https://v3.football.api-sports.io/standings"
 # Poller Config
 SYNC_INTERVAL_SECONDS = int(os.getenv("SYNC_INTERVAL_SECONDS", 1800))  # Default 30min
 ENRICHMENT_CHECK_INTERVAL_SECONDS = 60 * 60
-MAX_WORKERS = 4 
-FIXTURE_UPSERT_CHUNK_SIZE = 250 
+IDLE_INTERVAL_MULTIPLIER = int(os.getenv("SYNC_IDLE_MULTIPLIER", 2)) # Sleep multiplier once recent cycles saw no changes
+ACTIVITY_WINDOW_CYCLES = 6 # Cycles of fixture activity considered before backing off
+DATE_FETCH_TIMEOUT_SECONDS = 180 # Upper bound for one date worker, retries and rate-limit waits included
+MAX_WORKERS = 4 # Enrichment leagues in flight, each holding one pooled connection
+SYNC_FIXED_CONNECTIONS = 2 # store_fixtures plus the predictor run's main connection
+API_KEEPALIVE_SECONDS = 60 # Idle keep-alive per connection (aiohttp default is 15s)
+API_DNS_CACHE_SECONDS = 600 # aiohttp default is 10s
+AS_REQUESTS_PER_MINUTE = int(os.getenv("AS_REQUESTS_PER_MINUTE", 10)) # API-Sports per-minute plan limit
+FIXTURE_UPSERT_CHUNK_SIZE = int(os.getenv("FIXTURE_UPSERT_CHUNK_SIZE", 2000)) # Rows per staging COPY + merge
 MAPPING_FILE = "mapping.json"
+SYNC_STATE_FILE = os.getenv("SYNC_STATE_FILE", "sync_state.json") # Payload hashes and HTTP validators kept across restarts
+# Fixture statuses whose ids are handed to the predictor after an upsert
+PREDICTABLE_STATUSES = frozenset({'TBD', 'NS', '1H', 'HT', '2H', 'ET', 'P', 'INT', 'FT'})
+# Terminal statuses: a date whose fixtures are all in this set is only re-polled every SETTLED_DATE_POLL_EVERY cycles
+FINISHED_STATUSES = frozenset({'FT', 'AET', 'PEN', 'CANC', 'ABD', 'AWD', 'WO'})
+SETTLED_DATE_POLL_EVERY = 6
+SYNC_ADVISORY_LOCK_ID = 728491 # pg advisory lock key held while a fixtures batch is written
+EMPTY_MAPPING: Dict[str, Any] = {} # Shared read-only default for absent nested API sections
+TEAM_COLUMNS = ['team_id', 'name', 'code', 'country', 'founded', 'national', 'logo_url', 'venue_id']
 
 # Enrichment Config Constants from db_utils
 COOLDOWN_HOURS = db_utils.ENRICHMENT_COOLDOWN_HOURS
@@ -58,6 +94,7 @@ BATCH_SIZE = db_utils.ENRICHMENT_BATCH_SIZE * 2 # 20 leagues, 2 calls per league
 API_HEADERS = {
     "x-apisports-key": AS_API_KEY,
     "Content-Type": "application/json",
+    "Accept-Encoding": "gzip",
 }
 
 # Date utility
@@ -65,20 +102,135 @@ TIMEZONE = pytz.timezone("UTC") # API-Football dates are typically UTC
 
 # Global to store priority league IDs
 PRIORITY_LEAGUE_IDS: Set[int] = set()
+# blake2b digest of the last stored fixtures payload per date (YYYY-MM-DD)
+LAST_RESPONSE_HASH: Dict[str, str] = {}
+# ETag / Last-Modified validators from the last stored fixtures response per date, sent back as conditional headers
+HTTP_VALIDATORS: Dict[str, Dict[str, str]] = {}
+# Returned by async_get when the server answers 304 Not Modified
+NOT_MODIFIED = object()
+# Dates (YYYY-MM-DD) whose last fetched fixtures had all finished
+SETTLED_DATES: Set[str] = set()
+# Parent rows (seasons/venues/teams/leagues) last committed by update_fixtures_db, keyed by primary key;
+# identical rows are not re-sent. Cleared every PARENT_CACHE_TTL_SECONDS so outside edits get re-synced.
+PARENT_CACHE_TTL_SECONDS = 60 * 60
+PARENT_ROWS_WRITTEN: Dict[str, Dict[Any, tuple]] = {'seasons': {}, 'venues': {}, 'teams': {}, 'leagues': {}}
+PARENT_ROWS_RESET_AT = 0.0 # Monotonic deadline for the next clear
 LAST_ENRICHMENT_RUN: dt.datetime = dt.datetime.now(tz=UTC) - dt.timedelta(days=1) # Initialize to allow first run
 
+# Predictor runs on one background thread; IDs arriving mid-run wait in PENDING_PREDICTION_IDS
+PREDICTOR_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="Predictor")
+PREDICTOR_LOCK = threading.Lock()
+PREDICTOR_STOPPING = threading.Event() # Set on shutdown: the drain finishes its current run and exits
+PENDING_PREDICTION_IDS: Set[int] = set()
+# IDs from a failed run; their payload hashes are already recorded, so they are re-queued with the next cycle
+FAILED_PREDICTION_IDS: Set[int] = set()
+PREDICTOR_SCHEDULED = False
+PREDICTOR_RUN_WORKERS = predictor.PREDICTOR_MAX_WORKERS # Worker threads per run; capped by check_pool_budget
+
+# ============ UPSERT SQL (built once at import) ============
+
+FIXTURE_COLUMNS = [
+    'fixture_id', 'referee', 'date', 'timestamp', 'status_long', 'status_short', 'elapsed',
+    'home_winner', 'away_winner', 'goals_home', 'goals_away',
+    'score_ht_home', 'score_ht_away', 'score_ft_home', 'score_ft_away',
+    'score_et_home', 'score_et_away', 'score_pen_home', 'score_pen_away',
+    'league_id', 'season_year', 'home_team_id', 'away_team_id', 'venue_id'
+]
+# C-level row extractors: dict -> tuple in column order (replaces per-row generator expressions)
+fixture_row = itemgetter(*FIXTURE_COLUMNS)
+venue_row = itemgetter('venue_id', 'name', 'city', 'country')
+league_row = itemgetter('league_id', 'name', 'type', 'logo_url', 'country_name')
+
+# Fixtures are COPYed into fixtures_staging (db_utils.copy_to_staging), then merged
+_fixture_column_list = ", ".join(FIXTURE_COLUMNS)
+_fixture_staging_columns = ", ".join(f'"{col}"' for col in FIXTURE_COLUMNS)
+FIXTURE_UPSERT_SQL = f"""
+    INSERT INTO fixtures ({_fixture_column_list}) 
+    SELECT {_fixture_staging_columns} FROM fixtures_staging
+    ON CONFLICT (fixture_id) DO UPDATE SET
+        referee = EXCLUDED.referee,
+        date = EXCLUDED.date::TIMESTAMP WITH TIME ZONE, 
+        "timestamp" = EXCLUDED.timestamp,
+        status_long = EXCLUDED.status_long,
+        status_short = EXCLUDED.status_short,
+        elapsed = EXCLUDED.elapsed::INTEGER, 
+        home_winner = EXCLUDED.home_winner::BOOLEAN,
+        away_winner = EXCLUDED.away_winner::BOOLEAN,
+        goals_home = EXCLUDED.goals_home::INTEGER,
+        goals_away = EXCLUDED.goals_away::INTEGER,
+        score_ht_home = EXCLUDED.score_ht_home::INTEGER,
+        score_ht_away = EXCLUDED.score_ht_away::INTEGER,
+        score_ft_home = EXCLUDED.score_ft_home::INTEGER,
+        score_ft_away = EXCLUDED.score_ft_away::INTEGER,
+        score_et_home = EXCLUDED.score_et_home::INTEGER, 
+        score_et_away = EXCLUDED.score_et_away::INTEGER,
+        score_pen_home = EXCLUDED.score_pen_home::INTEGER,
+        score_pen_away = EXCLUDED.score_pen_away::INTEGER,
+
+        -- Only update FKs if they were null (optional, safety first)
+        league_id = COALESCE(fixtures.league_id, EXCLUDED.league_id),
+        season_year = COALESCE(fixtures.season_year, EXCLUDED.season_year),
+        home_team_id = COALESCE(fixtures.home_team_id, EXCLUDED.home_team_id),
+        away_team_id = COALESCE(fixtures.away_team_id, EXCLUDED.away_team_id),
+        venue_id = COALESCE(fixtures.venue_id, EXCLUDED.venue_id)
+    -- Skip the write (and its dead tuple/WAL) when the polled row is unchanged
+    WHERE (
+        fixtures.referee, fixtures.date, fixtures."timestamp", fixtures.status_long, fixtures.status_short,
+        fixtures.elapsed, fixtures.home_winner, fixtures.away_winner, fixtures.goals_home, fixtures.goals_away,
+        fixtures.score_ht_home, fixtures.score_ht_away, fixtures.score_ft_home, fixtures.score_ft_away,
+        fixtures.score_et_home, fixtures.score_et_away, fixtures.score_pen_home, fixtures.score_pen_away
+    ) IS DISTINCT FROM (
+        EXCLUDED.referee, EXCLUDED.date, EXCLUDED."timestamp", EXCLUDED.status_long, EXCLUDED.status_short,
+        EXCLUDED.elapsed, EXCLUDED.home_winner, EXCLUDED.away_winner, EXCLUDED.goals_home, EXCLUDED.goals_away,
+        EXCLUDED.score_ht_home, EXCLUDED.score_ht_away, EXCLUDED.score_ft_home, EXCLUDED.score_ft_away,
+        EXCLUDED.score_et_home, EXCLUDED.score_et_away, EXCLUDED.score_pen_home, EXCLUDED.score_pen_away
+    )
+    -- ...or when a null FK would be filled by the COALESCEs above
+    OR (
+        fixtures.league_id, fixtures.season_year, fixtures.home_team_id, fixtures.away_team_id, fixtures.venue_id
+    ) IS DISTINCT FROM (
+        COALESCE(fixtures.league_id, EXCLUDED.league_id), COALESCE(fixtures.season_year, EXCLUDED.season_year),
+        COALESCE(fixtures.home_team_id, EXCLUDED.home_team_id), COALESCE(fixtures.away_team_id, EXCLUDED.away_team_id),
+        COALESCE(fixtures.venue_id, EXCLUDED.venue_id)
+    );
+"""
+
+# Fixture-sync teams are COPYed into teams_staging, then merged; COALESCE keeps existing data if new data is null
+# Columns: (team_id, name, code, country, founded, national, logo_url, venue_id) (8 columns)
+TEAM_UPSERT_SQL = """
+    INSERT INTO teams (team_id, name, code, country, founded, national, logo_url, venue_id) 
+    SELECT team_id, name, code, country, founded, national, logo_url, venue_id FROM teams_staging 
+    ON CONFLICT (team_id) DO UPDATE SET 
+        name = COALESCE(EXCLUDED.name, teams.name),
+        code = COALESCE(EXCLUDED.code, teams.code),
+        country = COALESCE(EXCLUDED.country, teams.country), 
+        logo_url = COALESCE(EXCLUDED.logo_url, teams.logo_url),
+        -- ONLY update venue_id if the existing one is NULL or the new one is not NULL
+        venue_id = COALESCE(teams.venue_id, EXCLUDED.venue_id)
+    -- Skip rows whose merged values equal what is already stored
+    WHERE (teams.name, teams.code, teams.country, teams.logo_url, teams.venue_id) IS DISTINCT FROM (
+        COALESCE(EXCLUDED.name, teams.name),
+        COALESCE(EXCLUDED.code, teams.code),
+        COALESCE(EXCLUDED.country, teams.country),
+        COALESCE(EXCLUDED.logo_url, teams.logo_url),
+        COALESCE(teams.venue_id, EXCLUDED.venue_id)
+    );
+"""
+
 # ============ UTILITIES ============
 
 def chunked(iterable, n):
-    """Simple internal chunker function."""
-    return [iterable[i:i + n] for i in range(0, len(iterable), n)]
+    """Simple internal chunker: yields successive n-sized slices, one at a time."""
+    for i in range(0, len(iterable), n):
+        yield iterable[i:i + n]
 
 def load_priority_league_ids():
     """Loads league IDs marked as PRIORITY from mapping.json."""
     global PRIORITY_LEAGUE_IDS
     try:
-        with open(MAPPING_FILE, 'r', encoding='utf-8') as f:
-            mappings = json.load(f)
+        # Binary read straight into json_loads (orjson when installed; its JSONDecodeError subclasses json's)
+        with open(MAPPING_FILE, 'rb') as f:
+            mappings = json_loads(f.read())
             league_map = mappings.get("leagues", {})
             for data in league_map.values():
                 if "api_football_id" in data:
@@ -89,6 +241,64 @@ def load_priority_league_ids():
     except json.JSONDecodeError:
         logging.error(f"Could not parse {MAPPING_FILE}. Priority leagues disabled.")
 
+def start_queue_logging() -> QueueListener:
+    """
+    Moves the root handlers behind a QueueHandler so log calls from the event loop and the
+    predictor threads only enqueue; a background QueueListener does the actual writes.
+    """
+    root = logging.getLogger()
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    return listener
+
+def load_sync_state():
+    """Restores the per-date payload hashes and HTTP validators saved by the previous run."""
+    try:
+        with open(SYNC_STATE_FILE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        LAST_RESPONSE_HASH.update(state.get("hashes", {}))
+        HTTP_VALIDATORS.update(state.get("validators", {}))
+        logging.info(f"Restored sync state for {len(LAST_RESPONSE_HASH)} dates from {SYNC_STATE_FILE}.")
+    except FileNotFoundError:
+        pass
+    except (json.JSONDecodeError, AttributeError):
+        logging.warning(f"Could not parse {SYNC_STATE_FILE}. Starting with an empty sync state.")
+
+def save_sync_state(dates_to_keep: List[str]):
+    """Writes the hashes and validators for the dates still being polled (atomic replace)."""
+    state = {
+        "hashes": {d: LAST_RESPONSE_HASH[d] for d in dates_to_keep if d in LAST_RESPONSE_HASH},
+        "validators": {d: HTTP_VALIDATORS[d] for d in dates_to_keep if d in HTTP_VALIDATORS},
+    }
+    tmp_path = f"{SYNC_STATE_FILE}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, SYNC_STATE_FILE)
+    except OSError as e:
+        logging.warning(f"Could not save sync state to {SYNC_STATE_FILE}: {e}")
+
+def check_pool_budget():
+    """
+    Peak pool demand is every enrichment worker, store_fixtures, and a predictor run (its main
+    connection plus one per worker thread), all at once. Caps the predictor's workers to the
+    connections left (PREDICTOR_RUN_WORKERS), and fails fast when the pool cannot fit even one.
+    """
+    global PREDICTOR_RUN_WORKERS
+    spare = db_utils.POOL_MAX - MAX_WORKERS - SYNC_FIXED_CONNECTIONS
+    if spare < 1:
+        raise RuntimeError(
+            f"DB_POOL_MAX={db_utils.POOL_MAX} is too small: {MAX_WORKERS} enrichment workers and "
+            f"{SYNC_FIXED_CONNECTIONS} fixed connections leave none for the predictor."
+        )
+    PREDICTOR_RUN_WORKERS = min(predictor.PREDICTOR_MAX_WORKERS, spare)
+    if PREDICTOR_RUN_WORKERS < predictor.PREDICTOR_MAX_WORKERS:
+        logging.warning(f"PREDICTOR_MAX_WORKERS={predictor.PREDICTOR_MAX_WORKERS} exceeds the pool budget. Capping at {spare}.")
+    peak = MAX_WORKERS + SYNC_FIXED_CONNECTIONS + PREDICTOR_RUN_WORKERS
+    logging.info(f"DB pool budget: peak demand {peak} of {db_utils.POOL_MAX} connections.")
+
 def initialize_priority_status():
     """
     On startup, ensures that all leagues listed in mapping.json (PRIORITY leagues)
@@ -120,7 +330,7 @@ def initialize_priority_status():
                     last_enriched_at = CASE WHEN enrichment_status.status != 'ENRICHED' OR enrichment_status.last_enriched_at < NOW() - INTERVAL '30 days' THEN EXCLUDED.last_enriched_at ELSE enrichment_status.last_enriched_at END;
             """
             
-            execute_values(cursor, upsert_sql, priority_values)
+            execute_values(cursor, upsert_sql, priority_values, page_size=db_utils.EXECUTE_VALUES_PAGE_SIZE)
             conn.commit()
             logging.info("[DB Init] Priority league statuses ensured in enrichment_status table.")
             
@@ -130,39 +340,166 @@ def initialize_priority_status():
     finally:
         db_utils.release_connection(conn)
 
-async def async_get(session, url, params=None):
-    """Async API fetch with retry and robust error handling."""
+class ApiAccessDenied(Exception):
+    """Raised by async_get after a 403 (bad key or plan limit) while API calls are suspended."""
+
+class SlidingWindowRateLimiter:
+    """
+    Async sliding-window limiter: at most `limit` request starts in any `period` seconds.
+    Callers only wait when the window is full, and only until its oldest call expires.
+    `limit` adapts AIMD-style: halved on a 429, grown back by one per success up to `max_calls`.
+    """
+
+    def __init__(self, max_calls: int, period: float = 60.0):
+        self.max_calls = max_calls
+        self.limit = max_calls
+        self.period = period
+        self.calls: deque = deque()
+        self.lock = asyncio.Lock()
+        self.paused_until = 0.0 # Monotonic time before which no request may start (server-reported)
+
+    def on_success(self):
+        """Additive increase back towards the configured plan limit."""
+        if self.limit < self.max_calls:
+            self.limit += 1
+
+    def on_throttled(self):
+        """Multiplicative decrease after the server rejected a request."""
+        self.limit = max(1, self.limit // 2)
+        logging.warning("[API] Throttled by server. Request window reduced to %d/%.0fs.", self.limit, self.period)
+
+    def pause(self, seconds: float):
+        """Blocks new requests for `seconds`, e.g. from Retry-After or an exhausted per-minute quota."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        # Waiters queue on the lock, so slots are handed out in arrival order
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                while self.calls and now - self.calls[0] >= self.period:
+                    self.calls.popleft()
+                if len(self.calls) < self.limit:
+                    self.calls.append(now)
+                    return
+                await asyncio.sleep(self.calls[0] + self.period - now)
+
+API_RATE_LIMITER = SlidingWindowRateLimiter(AS_REQUESTS_PER_MINUTE)
+API_DENIED_BACKOFF_SECONDS = 15 * 60 # How long every API call fails fast after a 403
+API_DENIED_UNTIL = 0.0 # Monotonic deadline set by the last 403
+
+def observe_rate_limit_headers(headers):
+    """
+    Feeds API-Sports quota headers back into the limiter: pauses for a window when the
+    per-minute quota is spent and warns when the daily quota is exhausted.
+    """
+    minute_remaining = db_utils.safe_int(headers.get("X-RateLimit-Remaining"))
+    if minute_remaining is not None and minute_remaining <= 0:
+        logging.warning("[API] Per-minute quota exhausted. Pausing requests for %.0fs.", API_RATE_LIMITER.period)
+        API_RATE_LIMITER.pause(API_RATE_LIMITER.period)
+
+    daily_remaining = db_utils.safe_int(headers.get("x-ratelimit-requests-remaining"))
+    if daily_remaining is not None and daily_remaining <= 0:
+        logging.warning("[API] Daily request quota exhausted (x-ratelimit-requests-remaining=0).")
+
+def make_api_session() -> aiohttp.ClientSession:
+    """
+    Creates an API-Sports session whose connection pool is sized to MAX_WORKERS,
+    so concurrent requests reuse keep-alive connections instead of re-handshaking.
+    Idle connections and DNS answers are kept long enough to span a whole sync cycle.
+    (Retries are handled in async_get.)
+    """
+    connector = aiohttp.TCPConnector(
+        limit=MAX_WORKERS * 2,
+        limit_per_host=MAX_WORKERS,
+        keepalive_timeout=API_KEEPALIVE_SECONDS,
+        ttl_dns_cache=API_DNS_CACHE_SECONDS,
+    )
+    return aiohttp.ClientSession(headers=API_HEADERS, connector=connector)
+
+def remember_validators(cache_key: str, headers, store: Dict[str, Dict[str, str]]) -> None:
+    """Stores the response's ETag / Last-Modified in `store` as the conditional headers for the next request."""
+    validators = {}
+    if headers.get("ETag"):
+        validators["If-None-Match"] = headers["ETag"]
+    if headers.get("Last-Modified"):
+        validators["If-Modified-Since"] = headers["Last-Modified"]
+    if validators:
+        store[cache_key] = validators
+    else:
+        store.pop(cache_key, None)
+
+def adopt_validators(validators_by_key: Dict[str, Optional[Dict[str, str]]]) -> None:
+    """Makes fetched validators current once their payload is stored (None clears the key)."""
+    for cache_key, validators in validators_by_key.items():
+        if validators:
+            HTTP_VALIDATORS[cache_key] = validators
+        else:
+            HTTP_VALIDATORS.pop(cache_key, None)
+
+async def async_get(session, url, params=None, cache_key: Optional[str] = None,
+                    validators_out: Optional[Dict[str, Dict[str, str]]] = None):
+    """
+    Async API fetch with retry and robust error handling.
+    With a cache_key, the request is conditional on the validators stored for that key
+    and NOT_MODIFIED is returned on a 304. A 200's validators go to validators_out when
+    given (the caller adopts them after storing the payload), else straight to HTTP_VALIDATORS.
+    """
+    global API_DENIED_UNTIL
     for attempt in range(db_utils.MAX_RETRIES):
+        # A 403 is not transient: fail fast instead of spending more round-trips (and quota) on it
+        if time.monotonic() < API_DENIED_UNTIL:
+            raise ApiAccessDenied(f"API access suspended after a 403; skipping {url}")
         try:
-            async with session.get(url, params=params, timeout=db_utils.TIMEOUT_SECONDS) as response:
+            await API_RATE_LIMITER.acquire()
+            conditional_headers = HTTP_VALIDATORS.get(cache_key) if cache_key else None
+            async with session.get(url, params=params, headers=conditional_headers, timeout=db_utils.TIMEOUT_SECONDS) as response:
                 
                 # Check for rate limit/fatal error
                 if response.status == 403:
-                    logging.error(f"[API] FATAL 403: API Key issue or plan limit hit. Stopping API attempts.")
-                    return None
+                    logging.error("[API] FATAL 403: API Key issue or plan limit hit. Suspending API calls for %ds.", API_DENIED_BACKOFF_SECONDS)
+                    API_DENIED_UNTIL = time.monotonic() + API_DENIED_BACKOFF_SECONDS
+                    raise ApiAccessDenied(f"403 from {url}")
                 if response.status == 429:
-                    logging.warning(f"[API] Rate limit hit (429) for {url}. Retrying in {db_utils.RETRY_SLEEP_SECONDS}s...")
-                    await asyncio.sleep(db_utils.RETRY_SLEEP_SECONDS * (2 ** attempt))
+                    # Honour the server's Retry-After; fall back to exponential backoff when absent
+                    retry_after = db_utils.safe_int(response.headers.get("Retry-After"))
+                    delay = retry_after if retry_after is not None else db_utils.RETRY_SLEEP_SECONDS * (2 ** attempt)
+                    logging.warning("[API] Rate limit hit (429) for %s. Retrying in %ss...", url, delay)
+                    API_RATE_LIMITER.pause(delay) # Holds back every caller, not just this one
+                    API_RATE_LIMITER.on_throttled()
                     continue # Go to next attempt
                     
                 response.raise_for_status() 
+                API_RATE_LIMITER.on_success()
+                observe_rate_limit_headers(response.headers)
+                
+                if response.status == 304:
+                    return NOT_MODIFIED
                 
-                data = await response.json()
+                # Decode straight from the body bytes (orjson takes bytes; json.loads detects the encoding)
+                data = json_loads(await response.read())
                 
                 if data.get("errors"):
-                    logging.error(f"[API] API returned errors: {data.get('errors')} for {url}")
+                    logging.error("[API] API returned errors: %s for %s", data.get('errors'), url)
                     return None
+                if cache_key:
+                    remember_validators(cache_key, response.headers, HTTP_VALIDATORS if validators_out is None else validators_out)
                 return data
                 
         except aiohttp.ClientError as e:
-            logging.warning(f"[API] Client error (attempt {attempt+1}): {e} to {url}")
+            logging.warning("[API] Client error (attempt %d): %s to %s", attempt + 1, e, url)
         except asyncio.TimeoutError:
-            logging.warning(f"[API] Request timed out (attempt {attempt+1}): {url}")
+            logging.warning("[API] Request timed out (attempt %d): %s", attempt + 1, url)
+        except ValueError as e: # json.JSONDecodeError and orjson.JSONDecodeError both subclass it
+            logging.warning("[API] Invalid JSON body (attempt %d): %s from %s", attempt + 1, e, url)
             
         if attempt < db_utils.MAX_RETRIES - 1:
             await asyncio.sleep(db_utils.RETRY_SLEEP_SECONDS * (2 ** attempt))
             
-    logging.error(f"[API] Request to {url} failed after {db_utils.MAX_RETRIES} attempts.")
+    logging.error("[API] Request to %s failed after %d attempts.", url, db_utils.MAX_RETRIES)
     return None
 
 # ============ HIGH-FREQUENCY SYNC LOGIC (Fixtures) ============
@@ -173,35 +510,48 @@ def transform_fixture_data(fixture: Dict[str, Any]) -> Tuple[int, Dict[str, Any]
     Includes Foreign Keys (league_id, team_ids, season_year) required for UPSERT.
     """
     
+    # Hoist the nested sections once instead of re-indexing them per field
+    fixture_info = fixture['fixture']
+    goals = fixture['goals']
+    score = fixture['score']
+    league = fixture['league']
+    teams = fixture['teams']
+    
     # 1. Extract IDs
-    fixture_id = fixture['fixture']['id']
+    fixture_id = fixture_info['id']
     
     # 2. Extract Status
-    status = fixture['fixture']['status']
+    status = fixture_info['status']
     status_short = status['short']
     status_long = status['long']
     
     # 3. Extract Goals (ensure they are integers, even if API sends None)
-    goals_home = db_utils.safe_int(fixture['goals']['home'])
-    goals_away = db_utils.safe_int(fixture['goals']['away'])
+    goals_home = db_utils.safe_int(goals['home'])
+    goals_away = db_utils.safe_int(goals['away'])
 
     # 4. Determine Winner (based on FT goals)
-    home_winner = goals_home > goals_away if goals_home is not None and goals_away is not None else None
-    away_winner = goals_away > goals_home if goals_home is not None and goals_away is not None else None
+    if goals_home is not None and goals_away is not None:
+        home_winner = goals_home > goals_away
+        away_winner = goals_away > goals_home
+    else:
+        home_winner = away_winner = None
     
     # 5. Extract Scores (handle None for non-existent periods)
-    score_ht_home = db_utils.safe_int(fixture['score']['halftime']['home'])
-    score_ht_away = db_utils.safe_int(fixture['score']['halftime']['away'])
+    halftime = score['halftime']
+    score_ht_home = db_utils.safe_int(halftime['home'])
+    score_ht_away = db_utils.safe_int(halftime['away'])
     
     # FT scores are goals_home/away (needed for final score columns)
     score_ft_home = goals_home
     score_ft_away = goals_away
     
-    score_et_home = db_utils.safe_int(fixture['score']['extratime']['home'])
-    score_et_away = db_utils.safe_int(fixture['score']['extratime']['away'])
+    extratime = score['extratime']
+    score_et_home = db_utils.safe_int(extratime['home'])
+    score_et_away = db_utils.safe_int(extratime['away'])
     
-    score_pen_home = db_utils.safe_int(fixture['score']['penalty']['home'])
-    score_pen_away = db_utils.safe_int(fixture['score']['penalty']['away'])
+    penalty = score['penalty']
+    score_pen_home = db_utils.safe_int(penalty['home'])
+    score_pen_away = db_utils.safe_int(penalty['away'])
 
     # 6. Calculate total goals (FT + ET)
     # Ensure goals_home/away and extra-time scores are treated as 0 if None
@@ -209,21 +559,22 @@ def transform_fixture_data(fixture: Dict[str, Any]) -> Tuple[int, Dict[str, Any]
     total_goals_away = (goals_away or 0) + (score_et_away or 0)
     
     # 7. Extract Foreign Keys (NEW for UPSERT)
-    league_id = fixture['league']['id']
-    season_year = fixture['league']['season']
-    home_team_id = fixture['teams']['home']['id']
-    away_team_id = fixture['teams']['away']['id']
-    venue_id = fixture['fixture']['venue']['id'] if fixture['fixture']['venue'] and fixture['fixture']['venue']['id'] else None
+    league_id = league['id']
+    season_year = league['season']
+    home_team_id = teams['home']['id']
+    away_team_id = teams['away']['id']
+    venue = fixture_info['venue']
+    venue_id = venue['id'] if venue and venue['id'] else None
 
     # 8. Package data for UPSERT
     update_data = {
         'fixture_id': fixture_id,
-        'referee': fixture['fixture'].get('referee'),
-        'date': fixture['fixture']['date'], # ISO string (e.g., '2025-11-14T20:00:00+00:00')
-        'timestamp': fixture['fixture']['timestamp'], # Unix timestamp (integer)
+        'referee': fixture_info.get('referee'),
+        'date': fixture_info['date'], # ISO string (e.g., '2025-11-14T20:00:00+00:00')
+        'timestamp': fixture_info['timestamp'], # Unix timestamp (integer)
         'status_long': status_long,
         'status_short': status_short,
-        'elapsed': db_utils.safe_int(fixture['fixture']['status'].get('elapsed')),
+        'elapsed': db_utils.safe_int(status.get('elapsed')),
         'home_winner': home_winner,
         'away_winner': away_winner,
         'goals_home': total_goals_home,
@@ -247,16 +598,31 @@ def transform_fixture_data(fixture: Dict[str, Any]) -> Tuple[int, Dict[str, Any]
 
     return fixture_id, update_data
 
-def update_fixtures_db(fixtures_data: List[Dict[str, Any]], conn) -> Set[int]:
+def unwritten_rows(kind: str, rows: List[tuple]) -> List[tuple]:
+    """Returns the rows (primary key first) that differ from what was last committed for this parent table."""
+    written = PARENT_ROWS_WRITTEN[kind]
+    return [row for row in rows if written.get(row[0]) != row]
+
+def update_fixtures_db(fixtures_data: List[Dict[str, Any]], conn) -> Tuple[bool, Set[int]]:
     """
     UPSERTs (Inserts or Updates) parent entities and then fixtures with schedule and result details.
     This sync function is called by the async worker and uses the provided DB connection.
+    Returns (ok, predictable_ids): ok is False when the transaction was rolled back, while an
+    empty id set after a commit just means no polled fixture is predictable.
     """
+    global PARENT_ROWS_RESET_AT
     if not fixtures_data:
-        return set()
+        return True, set()
 
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    if time.monotonic() >= PARENT_ROWS_RESET_AT:
+        for written in PARENT_ROWS_WRITTEN.values():
+            written.clear()
+        PARENT_ROWS_RESET_AT = time.monotonic() + PARENT_CACHE_TTL_SECONDS
+
+    # Plain cursor: this path only writes (no RETURNING), so no per-row dicts are ever needed
+    cursor = conn.cursor()
     updated_fixture_ids: Set[int] = set()
+    ok = False
     
     # --- 1. Extract Parent Data and Prepare Fixture Tuples ---
     teams_to_upsert = {}    # {team_id: {data}}
@@ -264,25 +630,24 @@ def update_fixtures_db(fixtures_data: List[Dict[str, Any]], conn) -> Set[int]:
     seasons_to_upsert = set() # {year}
     leagues_to_upsert = {} # {league_id: {data}}
     
-    UPSERT_COLUMNS = [
-        'fixture_id', 'referee', 'date', 'timestamp', 'status_long', 'status_short', 'elapsed',
-        'home_winner', 'away_winner', 'goals_home', 'goals_away',
-        'score_ht_home', 'score_ht_away', 'score_ft_home', 'score_ft_away',
-        'score_et_home', 'score_et_away', 'score_pen_home', 'score_pen_away',
-        'league_id', 'season_year', 'home_team_id', 'away_team_id', 'venue_id'
-    ]
-
     fixture_tuples = []
+    predictable_fixture_ids: Set[int] = set()
     
-    for fixture in fixtures_data:
+    # Deduplicate by fixture id (last occurrence wins), mirroring the team/venue/league dicts;
+    # ON CONFLICT DO UPDATE cannot touch the same row twice in one statement
+    unique_fixtures = {fixture['fixture']['id']: fixture for fixture in fixtures_data if fixture['fixture'].get('id')}
+    
+    for fixture in unique_fixtures.values():
         fixture_id, data = transform_fixture_data(fixture)
         
         # A. Collect Team Data
-        home_team = fixture['teams']['home']
-        away_team = fixture['teams']['away']
-        league_country = fixture['league'].get('country')
+        teams = fixture['teams']
+        league = fixture['league']
+        league_country = league.get('country')
+        venue_id = data['venue_id']
+        home_team_id = data['home_team_id']
         
-        for team in [home_team, away_team]:
+        for team in (teams['home'], teams['away']):
             team_id = team.get('id')
             if team_id and team_id not in teams_to_upsert:
                 # Include placeholders for code, founded, and national to ensure all 8 columns exist
@@ -295,13 +660,12 @@ def update_fixtures_db(fixtures_data: List[Dict[str, Any]], conn) -> Set[int]:
                     'national': None, # Placeholder for FIX 2
                     'logo_url': team.get('logo'),
                     # Only map venue if the team is the home team
-                    'venue_id': data.get('venue_id') if data.get('home_team_id') == team_id else None
+                    'venue_id': venue_id if home_team_id == team_id else None
                 }
 
         # B. Collect Venue Data
-        venue = fixture['fixture']['venue']
-        venue_id = data.get('venue_id')
         if venue_id and venue_id not in venues_to_upsert:
+            venue = fixture['fixture']['venue']
             venues_to_upsert[venue_id] = {
                 'venue_id': venue_id,
                 'name': venue.get('name'),
@@ -314,7 +678,6 @@ def update_fixtures_db(fixtures_data: List[Dict[str, Any]], conn) -> Set[int]:
         league_id = data['league_id']
         seasons_to_upsert.add(season_year)
         
-        league = fixture['league']
         if league_id and league_id not in leagues_to_upsert:
              leagues_to_upsert[league_id] = {
                 'league_id': league_id,
@@ -325,19 +688,21 @@ def update_fixtures_db(fixtures_data: List[Dict[str, Any]], conn) -> Set[int]:
             }
             
         # D. Prepare fixture tuple for bulk UPSERT
-        fixture_tuples.append(tuple(data[col] for col in UPSERT_COLUMNS))
+        fixture_tuples.append(fixture_row(data))
+        if data['status_short'] in PREDICTABLE_STATUSES:
+            predictable_fixture_ids.add(fixture_id)
 
     # --- 2. JIT UPSERT PARENT ENTITIES ---
     try:
         # 2a. Seasons (PK: year)
-        season_values = [(year,) for year in seasons_to_upsert]
+        season_values = unwritten_rows('seasons', [(year,) for year in seasons_to_upsert])
         if season_values:
-            execute_values(cursor, "INSERT INTO seasons (year) VALUES %s ON CONFLICT (year) DO NOTHING;", season_values)
-            logging.info(f"[DB] Upserted {len(seasons_to_upsert)} unique seasons.")
+            execute_values(cursor, "INSERT INTO seasons (year) VALUES %s ON CONFLICT (year) DO NOTHING;", season_values, page_size=db_utils.EXECUTE_VALUES_PAGE_SIZE)
+            logging.debug("[DB] Upserted %d unique seasons.", len(season_values))
 
         # 2b. Venues (PK: venue_id)
         # Note: Added 'country' to ensure it's set on first insert
-        venue_values = [tuple(v[col] for col in ['venue_id', 'name', 'city', 'country']) for v in venues_to_upsert.values()]
+        venue_values = unwritten_rows('venues', [venue_row(v) for v in venues_to_upsert.values()])
         if venue_values:
             venue_sql = """
                 INSERT INTO venues (venue_id, name, city, country) 
@@ -347,11 +712,11 @@ def update_fixtures_db(fixtures_data: List[Dict[str, Any]], conn) -> Set[int]:
                     city = EXCLUDED.city,
                     country = EXCLUDED.country;
             """
-            execute_values(cursor, venue_sql, venue_values)
-            logging.info(f"[DB] Upserted {len(venues_to_upsert)} unique venues.")
+            execute_values(cursor, venue_sql, venue_values, page_size=db_utils.EXECUTE_VALUES_PAGE_SIZE)
+            logging.debug("[DB] Upserted %d unique venues.", len(venue_values))
 
         # 2c. Teams (PK: team_id) - Uses COALESCE to keep existing data if new data is null
-        team_values = [
+        team_values = unwritten_rows('teams', [
             (
                 t.get('team_id'), 
                 t.get('name'), 
@@ -363,26 +728,16 @@ def update_fixtures_db(fixtures_data: List[Dict[str, Any]], conn) -> Set[int]:
                 t.get('venue_id')
             ) 
             for t in teams_to_upsert.values()
-        ]
+        ])
 
         if team_values:
-            # Columns in SQL: (team_id, name, code, country, founded, national, logo_url, venue_id) (8 columns)
-            team_sql = """
-                INSERT INTO teams (team_id, name, code, country, founded, national, logo_url, venue_id) 
-                VALUES %s 
-                ON CONFLICT (team_id) DO UPDATE SET 
-                    name = COALESCE(EXCLUDED.name, teams.name),
-                    code = COALESCE(EXCLUDED.code, teams.code),
-                    country = COALESCE(EXCLUDED.country, teams.country), 
-                    logo_url = COALESCE(EXCLUDED.logo_url, teams.logo_url),
-                    -- ONLY update venue_id if the existing one is NULL or the new one is not NULL
-                    venue_id = COALESCE(teams.venue_id, EXCLUDED.venue_id);
-            """
-            execute_values(cursor, team_sql, team_values)
-            logging.info(f"[DB] Upserted {len(teams_to_upsert)} unique teams.")
+            # Rows are streamed with COPY into teams_staging and merged in one statement (TEAM_UPSERT_SQL)
+            db_utils.copy_to_staging(cursor, "teams", TEAM_COLUMNS, team_values)
+            cursor.execute(TEAM_UPSERT_SQL)
+            logging.debug("[DB] Upserted %d unique teams.", len(team_values))
 
         # 2d. Leagues (PK: league_id)
-        league_values = [tuple(l[col] for col in ['league_id', 'name', 'type', 'logo_url', 'country_name']) for l in leagues_to_upsert.values()]
+        league_values = unwritten_rows('leagues', [league_row(l) for l in leagues_to_upsert.values()])
         if league_values:
             league_sql = """
                 INSERT INTO leagues (league_id, name, type, logo_url, country_name) 
@@ -393,67 +748,37 @@ def update_fixtures_db(fixtures_data: List[Dict[str, Any]], conn) -> Set[int]:
                     logo_url = EXCLUDED.logo_url, 
                     country_name = EXCLUDED.country_name;
             """
-            execute_values(cursor, league_sql, league_values)
-            logging.info(f"[DB] Upserted {len(leagues_to_upsert)} unique leagues.")
+            execute_values(cursor, league_sql, league_values, page_size=db_utils.EXECUTE_VALUES_PAGE_SIZE)
+            logging.debug("[DB] Upserted %d unique leagues.", len(league_values))
             
             # --- 2e. JIT UPSERT Enrichment Status (Set new leagues to PENDING/PRIORITY) ---
             thirty_days_ago = dt.datetime.now(tz=UTC) - dt.timedelta(days=30)
-            enrichment_values = [(lid, 'PENDING' if lid not in PRIORITY_LEAGUE_IDS else 'PRIORITY', thirty_days_ago) for lid in leagues_to_upsert.keys()]
+            enrichment_values = [(row[0], 'PENDING' if row[0] not in PRIORITY_LEAGUE_IDS else 'PRIORITY', thirty_days_ago) for row in league_values]
             if enrichment_values:
                 enrichment_sql = """
                     INSERT INTO enrichment_status (league_id, status, last_enriched_at)
                     VALUES %s
                     ON CONFLICT (league_id) DO NOTHING;
                 """
-                execute_values(cursor, enrichment_sql, enrichment_values)
+                execute_values(cursor, enrichment_sql, enrichment_values, page_size=db_utils.EXECUTE_VALUES_PAGE_SIZE)
                 
         # --- 3. UPSERT FIXTURES (in chunks) ---
         
-        value_placeholders = ", ".join(UPSERT_COLUMNS) 
-        upsert_sql = f"""
-            INSERT INTO fixtures ({value_placeholders}) 
-            VALUES %s
-            ON CONFLICT (fixture_id) DO UPDATE SET
-                referee = EXCLUDED.referee,
-                date = EXCLUDED.date::TIMESTAMP WITH TIME ZONE, 
-                "timestamp" = EXCLUDED.timestamp,
-                status_long = EXCLUDED.status_long,
-                status_short = EXCLUDED.status_short,
-                elapsed = EXCLUDED.elapsed::INTEGER, 
-                home_winner = EXCLUDED.home_winner::BOOLEAN,
-                away_winner = EXCLUDED.away_winner::BOOLEAN,
-                goals_home = EXCLUDED.goals_home::INTEGER,
-                goals_away = EXCLUDED.goals_away::INTEGER,
-                score_ht_home = EXCLUDED.score_ht_home::INTEGER,
-                score_ht_away = EXCLUDED.score_ht_away::INTEGER,
-                score_ft_home = EXCLUDED.score_ft_home::INTEGER,
-                score_ft_away = EXCLUDED.score_ft_away::INTEGER,
-                score_et_home = EXCLUDED.score_et_home::INTEGER, 
-                score_et_away = EXCLUDED.score_et_away::INTEGER,
-                score_pen_home = EXCLUDED.score_pen_home::INTEGER,
-                score_pen_away = EXCLUDED.score_pen_away::INTEGER,
-                
-                -- Only update FKs if they were null (optional, safety first)
-                league_id = COALESCE(fixtures.league_id, EXCLUDED.league_id),
-                season_year = COALESCE(fixtures.season_year, EXCLUDED.season_year),
-                home_team_id = COALESCE(fixtures.home_team_id, EXCLUDED.home_team_id),
-                away_team_id = COALESCE(fixtures.away_team_id, EXCLUDED.away_team_id),
-                venue_id = COALESCE(fixtures.venue_id, EXCLUDED.venue_id)
-                
-            RETURNING fixture_id, status_short;
-        """
         total_upserted_count = 0
         
         for chunk in chunked(fixture_tuples, FIXTURE_UPSERT_CHUNK_SIZE):
-            execute_values(cursor, upsert_sql, chunk)
+            # COPY the chunk into fixtures_staging, then merge it in a single INSERT ... SELECT
+            db_utils.copy_to_staging(cursor, "fixtures", FIXTURE_COLUMNS, chunk)
+            cursor.execute(FIXTURE_UPSERT_SQL)
             total_upserted_count += cursor.rowcount
-            
-            for row in cursor.fetchall():
-                if row['status_short'] in ['TBD', 'NS', '1H', 'HT', '2H', 'ET', 'P', 'INT', 'FT']:
-                    updated_fixture_ids.add(row['fixture_id'])
 
         conn.commit()
-        logging.info(f"[DB] Successfully upserted {total_upserted_count} fixtures (across all chunks).")
+        for kind, values in (('seasons', season_values), ('venues', venue_values), ('teams', team_values), ('leagues', league_values)):
+            PARENT_ROWS_WRITTEN[kind].update((row[0], row) for row in values)
+        # Unchanged rows are no longer written, so prediction candidates come from the polled data
+        updated_fixture_ids = predictable_fixture_ids
+        ok = True
+        logging.info(f"[DB] Successfully upserted {total_upserted_count} new/changed fixtures of {len(fixture_tuples)} polled (across all chunks).")
         
     except Exception as e:
         conn.rollback()
@@ -461,39 +786,132 @@ def update_fixtures_db(fixtures_data: List[Dict[str, Any]], conn) -> Set[int]:
     finally:
         cursor.close()
         
-    return updated_fixture_ids
+    return ok, updated_fixture_ids
 
-async def worker_process_date(date_to_fetch: dt.date) -> Set[int]:
-    """Async worker to fetch data for a date and update the DB."""
+async def worker_process_date(session, date_to_fetch: dt.date) -> Tuple[str, List[Dict[str, Any]], Optional[str], Optional[Dict[str, str]], bool]:
+    """
+    Async worker to fetch fixtures for a date on the cycle's shared session.
+    Returns (date_str, fixtures, response_hash, validators, is_settled); fixtures is empty when the
+    payload is unchanged since it was last stored. The DB write happens once per cycle in store_fixtures,
+    and the caller adopts the validators and the settled flag only after it commits.
+    """
     date_str = date_to_fetch.isoformat()
-    fixtures = []
     
+    params = {"date": date_str}
+    logging.debug("[API] Fetching fixtures for date: %s...", date_str)
+    
+    fetched_validators: Dict[str, Dict[str, str]] = {}
+    data = await async_get(session, AS_FIXTURES_URL, params, cache_key=date_str, validators_out=fetched_validators)
+    
+    if data is NOT_MODIFIED:
+        logging.info("[API] Fixtures for %s not modified (304). Skipping DB upsert.", date_str)
+        return date_str, [], None, None, False
+        
+    if not (data and data.get("response")):
+        return date_str, [], None, None, False
+
+    fixtures = data["response"]
+    logging.info("[API] Received %d fixtures for %s.", len(fixtures), date_str)
+    is_settled = all(f['fixture']['status']['short'] in FINISHED_STATUSES for f in fixtures)
+
+    # Skip the upsert when this date's payload is identical to the last one stored
+    response_hash = hashlib.blake2b(json_dumps_bytes(fixtures), digest_size=16).hexdigest()
+    if LAST_RESPONSE_HASH.get(date_str) == response_hash:
+        logging.info("[API] Fixtures for %s unchanged since last cycle. Skipping DB upsert.", date_str)
+        # This payload is already stored, so its validators can be used right away
+        adopt_validators({date_str: fetched_validators.get(date_str)})
+        if is_settled:
+            SETTLED_DATES.add(date_str)
+        else:
+            SETTLED_DATES.discard(date_str)
+        return date_str, [], None, None, False
+
+    return date_str, fixtures, response_hash, fetched_validators.get(date_str), is_settled
+
+def store_fixtures(fixtures: List[Dict[str, Any]]) -> Tuple[Optional[bool], Set[int]]:
+    """
+    UPSERTs the fixtures gathered by all date workers in one transaction on one pooled connection.
+    The transaction holds a Postgres advisory lock, so a second sync instance skips its write
+    instead of contending on the same rows. Returns (ok, predictable_ids) as update_fixtures_db does,
+    except that ok is None (not False) when the lock was held and nothing was attempted.
+    """
     conn = db_utils.get_connection()
     if conn is None:
-        return set()
-        
+        return False, set()
     try:
-        async with aiohttp.ClientSession(headers=API_HEADERS) as session:
-            params = {"date": date_str}
-            logging.info(f"[API] Fetching fixtures for date: {date_str}...")
-            
-            data = await async_get(session, AS_FIXTURES_URL, params)
-            
-            if data and data.get("response"):
-                fixtures = data["response"]
-                logging.info(f"[API] Received {len(fixtures)} fixtures for {date_str}.")
-            
-            if fixtures:
-                # DB call remains sync/blocking, but it's executed after the async fetch
-                return update_fixtures_db(fixtures, conn)
-            
+        with conn.cursor() as cursor:
+            # Transaction-scoped: released by update_fixtures_db's commit or rollback
+            cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", (SYNC_ADVISORY_LOCK_ID,))
+            if not cursor.fetchone()[0]:
+                conn.rollback()
+                logging.info("[DB] Another sync instance is writing fixtures. Deferring this cycle's upsert.")
+                return None, set()
+        return update_fixtures_db(fixtures, conn)
     finally:
         db_utils.release_connection(conn)
-        
-    return set()
 
 # ============ LOW-FREQUENCY ENRICHMENT LOGIC (Teams & Standings) ============
 
+def upsert_enriched_teams(conn, venue_tuples: List[tuple], team_tuples: List[tuple]):
+    """Upserts a league's enriched venues and teams on the worker's connection (runs in a thread)."""
+    # Upsert Venues (Synchronous DB call using provided conn)
+    with conn.cursor() as cursor:
+        venue_sql = """
+            INSERT INTO venues (venue_id, name, address, city, capacity, surface, image_url)
+            VALUES %s
+            ON CONFLICT (venue_id) DO UPDATE SET 
+                name = COALESCE(EXCLUDED.name, venues.name), 
+                address = EXCLUDED.address,
+                city = EXCLUDED.city, 
+                capacity = EXCLUDED.capacity, 
+                surface = EXCLUDED.surface, 
+                image_url = EXCLUDED.image_url;
+        """
+        execute_values(cursor, venue_sql, venue_tuples, page_size=db_utils.EXECUTE_VALUES_PAGE_SIZE)
+        
+        # Upsert Teams (Synchronous DB call using provided conn)
+        team_sql = """
+            INSERT INTO teams (team_id, name, code, country, founded, national, logo_url, venue_id) 
+            VALUES %s 
+            ON CONFLICT (team_id) DO UPDATE SET 
+                name = COALESCE(EXCLUDED.name, teams.name),
+                code = COALESCE(EXCLUDED.code, teams.code),
+                country = COALESCE(EXCLUDED.country, teams.country),
+                founded = COALESCE(EXCLUDED.founded, teams.founded),
+                national = EXCLUDED.national,
+                logo_url = COALESCE(EXCLUDED.logo_url, teams.logo_url),
+                venue_id = COALESCE(teams.venue_id, EXCLUDED.venue_id);
+        """
+        execute_values(cursor, team_sql, team_tuples, page_size=db_utils.EXECUTE_VALUES_PAGE_SIZE)
+
+def upsert_standings(conn, standings_tuples: List[tuple]):
+    """Upserts a league's standings on the worker's connection (runs in a thread)."""
+    # Upsert Standings (Synchronous DB call using provided conn)
+    with conn.cursor() as cursor:
+        standings_sql = """
+            INSERT INTO standings (
+                league_id, season_year, team_id, "rank", points, goals_diff, 
+                group_name, form, description, played, win, draw, lose, 
+                goals_for, goals_against
+            )
+            VALUES %s
+            ON CONFLICT (league_id, season_year, team_id) DO UPDATE SET
+                "rank" = EXCLUDED."rank",
+                points = EXCLUDED.points,
+                goals_diff = EXCLUDED.goals_diff,
+                group_name = EXCLUDED.group_name,
+                form = EXCLUDED.form,
+                description = EXCLUDED.description,
+                played = EXCLUDED.played,
+                win = EXCLUDED.win,
+                draw = EXCLUDED.draw,
+                lose = EXCLUDED.lose,
+                goals_for = EXCLUDED.goals_for,
+                goals_against = EXCLUDED.goals_against,
+                update_date = NOW();
+        """
+        execute_values(cursor, standings_sql, standings_tuples, page_size=db_utils.EXECUTE_VALUES_PAGE_SIZE)
+
 async def fetch_and_upsert_teams(session, conn, league_id, season_year):
     """
     Async fetches all teams and their venues for a league, then sync updates the DB.
@@ -514,9 +932,11 @@ async def fetch_and_upsert_teams(session, conn, league_id, season_year):
         team_data_map = {}  
         venue_data_map = {} 
         
+        safe_str, safe_int = db_utils.safe_str, db_utils.safe_int
         for item in teams_data:
-            team = item.get('team', {})
-            venue = item.get('venue', {})
+            # `or EMPTY_MAPPING` avoids a throwaway dict per row and also covers explicit nulls
+            team = item.get('team') or EMPTY_MAPPING
+            venue = item.get('venue') or EMPTY_MAPPING
             
             team_id = team.get('id')
             venue_id = venue.get('id')
@@ -524,52 +944,25 @@ async def fetch_and_upsert_teams(session, conn, league_id, season_year):
             if team_id is not None and team_id not in team_data_map:
                 # Prepare tuple for teams table (8 columns)
                 team_data_map[team_id] = (
-                    team_id, db_utils.safe_str(team.get('name')), db_utils.safe_str(team.get('code')),
-                    db_utils.safe_str(team.get('country')), db_utils.safe_int(team.get('founded')),
-                    team.get('national', False), db_utils.safe_str(team.get('logo')),
-                    db_utils.safe_int(venue_id)
+                    team_id, safe_str(team.get('name')), safe_str(team.get('code')),
+                    safe_str(team.get('country')), safe_int(team.get('founded')),
+                    team.get('national', False), safe_str(team.get('logo')),
+                    safe_int(venue_id)
                 )
             
             if venue_id is not None and venue_id not in venue_data_map:
                 # Prepare tuple for venues table (7 columns)
                 venue_data_map[venue_id] = (
-                    venue_id, db_utils.safe_str(venue.get('name')), db_utils.safe_str(venue.get('address')),
-                    db_utils.safe_str(venue.get('city')), db_utils.safe_int(venue.get('capacity')), 
-                    db_utils.safe_str(venue.get('surface')), db_utils.safe_str(venue.get('image'))
+                    venue_id, safe_str(venue.get('name')), safe_str(venue.get('address')),
+                    safe_str(venue.get('city')), safe_int(venue.get('capacity')), 
+                    safe_str(venue.get('surface')), safe_str(venue.get('image'))
                 )
         
         team_tuples = list(team_data_map.values())
         venue_tuples = list(venue_data_map.values())
 
-        # Upsert Venues (Synchronous DB call using provided conn)
-        with conn.cursor() as cursor:
-            venue_sql = """
-                INSERT INTO venues (venue_id, name, address, city, capacity, surface, image_url)
-                VALUES %s
-                ON CONFLICT (venue_id) DO UPDATE SET 
-                    name = COALESCE(EXCLUDED.name, venues.name), 
-                    address = EXCLUDED.address,
-                    city = EXCLUDED.city, 
-                    capacity = EXCLUDED.capacity, 
-                    surface = EXCLUDED.surface, 
-                    image_url = EXCLUDED.image_url;
-            """
-            execute_values(cursor, venue_sql, venue_tuples)
-            
-            # Upsert Teams (Synchronous DB call using provided conn)
-            team_sql = """
-                INSERT INTO teams (team_id, name, code, country, founded, national, logo_url, venue_id) 
-                VALUES %s 
-                ON CONFLICT (team_id) DO UPDATE SET 
-                    name = COALESCE(EXCLUDED.name, teams.name),
-                    code = COALESCE(EXCLUDED.code, teams.code),
-                    country = COALESCE(EXCLUDED.country, teams.country),
-                    founded = COALESCE(EXCLUDED.founded, teams.founded),
-                    national = EXCLUDED.national,
-                    logo_url = COALESCE(EXCLUDED.logo_url, teams.logo_url),
-                    venue_id = COALESCE(teams.venue_id, EXCLUDED.venue_id);
-            """
-            execute_values(cursor, team_sql, team_tuples)
+        # The blocking upserts run on a worker thread so the event loop keeps serving other fetches
+        await asyncio.to_thread(upsert_enriched_teams, conn, venue_tuples, team_tuples)
             
         logging.info(f"[Enrichment] Successfully enriched {len(team_tuples)} unique teams for League {league_id}.")
         return 1
@@ -601,7 +994,8 @@ async def fetch_and_upsert_standings(session, conn, league_id, season_year):
         for standings_list in standings_lists:
             for rank_data in standings_list:
                 team_id = rank_data['team']['id']
-                stats = rank_data.get('all', {})
+                stats = rank_data.get('all') or EMPTY_MAPPING
+                goals = stats.get('goals') or EMPTY_MAPPING
                 
                 # Use a composite key for the map
                 composite_key = (league_id, season_year, team_id)
@@ -622,37 +1016,13 @@ async def fetch_and_upsert_standings(session, conn, league_id, season_year):
                         stats.get('win'),
                         stats.get('draw'),
                         stats.get('lose'),
-                        stats.get('goals', {}).get('for'),
-                        stats.get('goals', {}).get('against')
+                        goals.get('for'),
+                        goals.get('against')
                     )
 
         standings_tuples = list(standings_data_map.values())
         
-        # Upsert Standings (Synchronous DB call using provided conn)
-        with conn.cursor() as cursor:
-            standings_sql = """
-                INSERT INTO standings (
-                    league_id, season_year, team_id, "rank", points, goals_diff, 
-                    group_name, form, description, played, win, draw, lose, 
-                    goals_for, goals_against
-                )
-                VALUES %s
-                ON CONFLICT (league_id, season_year, team_id) DO UPDATE SET
-                    "rank" = EXCLUDED."rank",
-                    points = EXCLUDED.points,
-                    goals_diff = EXCLUDED.goals_diff,
-                    group_name = EXCLUDED.group_name,
-                    form = EXCLUDED.form,
-                    description = EXCLUDED.description,
-                    played = EXCLUDED.played,
-                    win = EXCLUDED.win,
-                    draw = EXCLUDED.draw,
-                    lose = EXCLUDED.lose,
-                    goals_for = EXCLUDED.goals_for,
-                    goals_against = EXCLUDED.goals_against,
-                    update_date = NOW();
-            """
-            execute_values(cursor, standings_sql, standings_tuples)
+        await asyncio.to_thread(upsert_standings, conn, standings_tuples)
 
         logging.info(f"[Enrichment] Successfully upserted {len(standings_tuples)} standings entries for League {league_id}.")
         return 1
@@ -661,8 +1031,8 @@ async def fetch_and_upsert_standings(session, conn, league_id, season_year):
         logging.error(f"[Enrichment] Failed to fetch/upsert standings for League {league_id}: {e}")
         return 0
         
-async def run_enrichment_worker(league_id, season_year):
-    """Executes all enrichment tasks for a single league using async calls."""
+async def run_enrichment_worker(session, league_id, season_year):
+    """Executes all enrichment tasks for a single league using async calls on the shared API session."""
     conn = db_utils.get_connection()
     if conn is None:
         logging.error(f"[Enrichment] Failed to get DB connection for League {league_id}.")
@@ -670,13 +1040,12 @@ async def run_enrichment_worker(league_id, season_year):
         
     total_calls = 0
     try:
-        async with aiohttp.ClientSession(headers=API_HEADERS) as session:
-            # 1. Fetch & Upsert Teams/Venues (1 API call)
-            total_calls += await fetch_and_upsert_teams(session, conn, league_id, season_year)
-            
-            # 2. Fetch & Upsert Standings (1 API call)
-            if total_calls == 1:
-                total_calls += await fetch_and_upsert_standings(session, conn, league_id, season_year)
+        # 1. Fetch & Upsert Teams/Venues (1 API call)
+        total_calls += await fetch_and_upsert_teams(session, conn, league_id, season_year)
+        
+        # 2. Fetch & Upsert Standings (1 API call)
+        if total_calls == 1:
+            total_calls += await fetch_and_upsert_standings(session, conn, league_id, season_year)
             
         # 3. Mark as enriched and commit
         if total_calls == 2:
@@ -698,14 +1067,15 @@ async def run_enrichment_worker(league_id, season_year):
         db_utils.release_connection(conn)
 
 
-async def run_enrichment_cycle():
+async def run_enrichment_cycle(session, now_utc: Optional[dt.datetime] = None):
     """
-    The low-frequency manager for costly enrichment tasks, now using asyncio.gather.
+    The low-frequency manager for costly enrichment tasks, now using asyncio.gather on the loop's shared session.
     Enforces the 24-hour cool-down and 20-league batch limit.
+    now_utc is the caller's cycle timestamp, so the cooldown is measured against the same clock reading.
     """
     global LAST_ENRICHMENT_RUN
     
-    current_time = dt.datetime.now(tz=UTC)
+    current_time = now_utc or dt.datetime.now(tz=UTC)
     
     # 1. Check Global Cooldown for external leagues (non-priority)
     time_since_last_run = current_time - LAST_ENRICHMENT_RUN
@@ -723,48 +1093,41 @@ async def run_enrichment_cycle():
     try:
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         
-        # --- 2. Determine Enrichment Targets (Sync DB calls) ---
-        
-        # a) PRIORITY Leagues (from mapping.json)
-        priority_sql = f"""
-            WITH latest_seasons AS (
-                SELECT 
-                    f.league_id, 
-                    MAX(f.season_year) as season_year
-                FROM fixtures f
-                GROUP BY f.league_id
-            )
-            SELECT DISTINCT es.league_id, ls.season_year
-            FROM enrichment_status es
-            LEFT JOIN latest_seasons ls ON es.league_id = ls.league_id 
-            WHERE es.status = 'PRIORITY' 
-            AND ls.season_year IS NOT NULL
-            AND (es.last_enriched_at < NOW() - INTERVAL '{COOLDOWN_HOURS} hours' OR es.last_enriched_at IS NULL);
-        """
-        cursor.execute(priority_sql)
-        priority_targets = cursor.fetchall()
-        targets_to_run.extend(priority_targets)
-        
-        # b) EXTERNAL (Non-Priority) Leagues - Only run if cooldown permits
-        if not is_cooldown_active:
-            external_sql = f"""
-                SELECT DISTINCT es.league_id, ls.season_year
+        # --- 2. Determine Enrichment Targets (one round-trip, bound parameters) ---
+        # a) PRIORITY leagues (from mapping.json) past their cooldown, at their latest fixture season
+        # b) EXTERNAL (PENDING) leagues, only when the global cooldown permits
+        targets_sql = """
+            WITH priority AS (
+                SELECT es.league_id, MAX(f.season_year) AS season_year, 'PRIORITY' AS status
+                FROM enrichment_status es
+                JOIN fixtures f ON f.league_id = es.league_id
+                WHERE es.status = 'PRIORITY'
+                AND f.season_year IS NOT NULL
+                AND (es.last_enriched_at < NOW() - %s * INTERVAL '1 hour' OR es.last_enriched_at IS NULL)
+                GROUP BY es.league_id
+            ),
+            external AS (
+                SELECT DISTINCT es.league_id, ls.season_year, 'PENDING' AS status
                 FROM enrichment_status es
                 JOIN league_seasons ls ON es.league_id = ls.league_id
-                WHERE es.status = 'PENDING' AND ls.is_current = TRUE
+                WHERE %s AND es.status = 'PENDING' AND ls.is_current = TRUE
                 ORDER BY es.league_id ASC
-                LIMIT {BATCH_SIZE // 2};
-            """
-            cursor.execute(external_sql)
-            external_targets = cursor.fetchall()
-            targets_to_run.extend(external_targets)
-            external_targets_count = len(external_targets)
+                LIMIT %s
+            )
+            SELECT league_id, season_year, status FROM priority
+            UNION ALL
+            SELECT league_id, season_year, status FROM external;
+        """
+        cursor.execute(targets_sql, (COOLDOWN_HOURS, not is_cooldown_active, BATCH_SIZE // 2))
+        targets_to_run = cursor.fetchall()
+        priority_count = sum(1 for t in targets_to_run if t['status'] == 'PRIORITY')
+        external_targets_count = len(targets_to_run) - priority_count
             
         if not targets_to_run:
             logging.info("[Enrichment] No pending leagues (PRIORITY or EXTERNAL) to enrich.")
             return
 
-        logging.info(f"[Enrichment] Running enrichment on {len(targets_to_run)} leagues (Priority: {len(priority_targets)}, External: {external_targets_count}).")
+        logging.info(f"[Enrichment] Running enrichment on {len(targets_to_run)} leagues (Priority: {priority_count}, External: {external_targets_count}).")
         
     except Exception as e:
         conn.rollback()
@@ -775,9 +1138,14 @@ async def run_enrichment_cycle():
 
 
     # --- 3. Execute Enrichment Tasks (Async Parallel) ---
-    results = await asyncio.gather(
-        *[run_enrichment_worker(t['league_id'], t['season_year']) for t in targets_to_run]
-    )
+    # At most MAX_WORKERS leagues at once: each holds a pooled DB connection for its whole run
+    worker_slots = asyncio.Semaphore(MAX_WORKERS)
+
+    async def run_bounded(target):
+        async with worker_slots:
+            return await run_enrichment_worker(session, target['league_id'], target['season_year'])
+
+    results = await asyncio.gather(*[run_bounded(t) for t in targets_to_run], return_exceptions=True)
     
     # --- 4. Update Cooldown Timer (After all async tasks finish) ---
     if external_targets_count > 0:
@@ -788,109 +1156,205 @@ async def run_enrichment_cycle():
 
 def trigger_predictor(fixture_ids: Set[int]):
     """
-    Executes predictor.py with the list of fixture IDs that need prediction.
+    Queues the fixture IDs for prediction and returns immediately.
+    The predictor runs on a single background worker; IDs that arrive while a run is in
+    flight are merged and predicted by the next run, so no cycle waits on the predictor.
+    IDs from a failed run are retried here, once per cycle.
     """
-    if not fixture_ids:
-        logging.info("No fixtures need prediction. Skipping predictor.py.")
-        return
-        
-    logging.info(f"Triggering predictor.py for {len(fixture_ids)} fixtures...")
-    
-    # Convert set to comma-separated string for subprocess argument
-    id_string = ",".join(map(str, fixture_ids))
-    
-    try:
-        process = subprocess.run(
-            [sys.executable, "predictor.py", "--fixtures", id_string],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        # Only log success stdout to prevent excessive logs
-        if process.returncode == 0:
-            logging.info(f"PREDICTOR SUCCESS. STDOUT: {process.stdout.strip()}")
-        else:
-            raise subprocess.CalledProcessError(process.returncode, "predictor.py", output=process.stdout, stderr=process.stderr)
+    global PREDICTOR_SCHEDULED
+    with PREDICTOR_LOCK:
+        fixture_ids = set(fixture_ids) | FAILED_PREDICTION_IDS
+        FAILED_PREDICTION_IDS.clear()
+        if not fixture_ids:
+            logging.info("No fixtures need prediction. Skipping predictor.")
+            return
+        PENDING_PREDICTION_IDS.update(fixture_ids)
+        if PREDICTOR_SCHEDULED:
+            logging.info(f"Predictor already running. {len(PENDING_PREDICTION_IDS)} fixtures queued for the next run.")
+            return
+        PREDICTOR_SCHEDULED = True
 
-    except subprocess.CalledProcessError as e:
-        logging.error(f"predictor.py failed with return code {e.returncode}")
-        logging.error(f"PREDICTOR STDOUT: {e.stdout}")
-        logging.error(f"PREDICTOR STDERR: {e.stderr}")
-    except FileNotFoundError:
-        logging.error("ERROR: predictor.py not found. Check file path.")
+    PREDICTOR_EXECUTOR.submit(drain_predictor_queue)
+
+def drain_predictor_queue():
+    """Runs the predictor until no queued fixture IDs remain (predictor worker thread)."""
+    global PREDICTOR_SCHEDULED
+    while True:
+        with PREDICTOR_LOCK:
+            if not PENDING_PREDICTION_IDS or PREDICTOR_STOPPING.is_set():
+                PREDICTOR_SCHEDULED = False
+                return
+            fixture_ids = set(PENDING_PREDICTION_IDS)
+            PENDING_PREDICTION_IDS.clear()
+        run_predictor(fixture_ids)
+
+def run_predictor(fixture_ids: Set[int]):
+    """
+    Runs the predictor in-process on the fixture IDs that need prediction.
+    It shares this process's DB pool, so no interpreter is spawned per run.
+    On failure the IDs are kept for the next trigger_predictor call.
+    """
+    logging.info(f"Triggering predictor for {len(fixture_ids)} fixtures...")
+    try:
+        predictor.run(sorted(fixture_ids), max_workers=PREDICTOR_RUN_WORKERS)
     except Exception as e:
-        logging.error(f"ERROR executing predictor.py: {e}")
+        logging.error(f"ERROR executing predictor: {e}. Retrying {len(fixture_ids)} fixtures next cycle.")
+        with PREDICTOR_LOCK:
+            FAILED_PREDICTION_IDS.update(fixture_ids)
 
 async def main_loop_async():
     """The main continuous polling loop using asyncio."""
-    today_utc = dt.datetime.now(tz=UTC).date()
-    yesterday_utc = today_utc - dt.timedelta(days=1)
-    tomorrow_utc = today_utc + dt.timedelta(days=1)
-    
-    dates_to_sync = [yesterday_utc, today_utc, tomorrow_utc]
+    # The yesterday/today/tomorrow window is rebuilt only when the UTC day rolls over
+    synced_day: Optional[dt.date] = None
+    dates_to_sync: List[dt.date] = []
     
-    # Initialize to force first check
-    last_enrichment_check = dt.datetime.now(tz=UTC) - dt.timedelta(hours=10) 
+    # None forces the first check; monotonic integer nanoseconds, so a wall-clock step cannot fire it twice or suppress it
+    last_enrichment_check_ns: Optional[int] = None
+    # Changed fixtures per recent cycle; a full window of zeros stretches the sleep
+    recent_activity = deque(maxlen=ACTIVITY_WINDOW_CYCLES)
+    cycle_count = 0
 
-    while True:
-        cycle_start_time = time.time()
+    # One session for the life of the loop (fixtures and enrichment): keep-alive connections and DNS answers survive between cycles
+    session = make_api_session()
+    # Cycles start on a fixed monotonic grid (immune to NTP steps); an overrun skips ticks instead of drifting
+    next_tick = time.monotonic()
+    try:
+        while True:
+            cycle_start_time = time.monotonic()
+            # Read the wall clock once per cycle: it drives the date window and the enrichment cooldown
+            cycle_now = dt.datetime.now(tz=UTC)
+            today_utc = cycle_now.date()
+            if today_utc != synced_day:
+                synced_day = today_utc
+                dates_to_sync = [today_utc - dt.timedelta(days=1), today_utc, today_utc + dt.timedelta(days=1)]
+                # Dates that left the window are never polled again
+                SETTLED_DATES.intersection_update(date.isoformat() for date in dates_to_sync)
         
-        # 1. Run High-Frequency Fixture Sync (Parallel using asyncio.gather)
-        logging.info(f"\n--- Sync Cycle Starting for: {dates_to_sync[0].isoformat()} to {dates_to_sync[-1].isoformat()} ---")
+            # Sync window for this cycle
+            logging.info(f"\n--- Sync Cycle Starting for: {dates_to_sync[0].isoformat()} to {dates_to_sync[-1].isoformat()} ---")
         
-        all_updated_ids: Set[int] = set()
+            all_updated_ids: Set[int] = set()
+            cycle_fixtures: List[Dict[str, Any]] = []
+            # Fully finished dates (usually yesterday) only need an occasional late-correction check
+            due_dates = [
+                date for date in dates_to_sync
+                if date.isoformat() not in SETTLED_DATES or cycle_count % SETTLED_DATE_POLL_EVERY == 0
+            ]
+            cycle_count += 1
+            
+            # 1. Low-frequency enrichment (when due) runs alongside the fixture fetch; it is joined before the cycle ends
+            enrichment_task: Optional[asyncio.Task] = None
+            check_ns = time.monotonic_ns()
+            if last_enrichment_check_ns is None or check_ns - last_enrichment_check_ns >= ENRICHMENT_CHECK_INTERVAL_SECONDS * 1_000_000_000:
+                logging.info("[MainThread] Starting low-frequency enrichment check.")
+                enrichment_task = asyncio.create_task(run_enrichment_cycle(session, now_utc=cycle_now))
+                last_enrichment_check_ns = check_ns # Reset check timer
         
-        try:
-            results = await asyncio.gather(
-                *[worker_process_date(date) for date in dates_to_sync],
-                return_exceptions=True
-            )
+            try:
+                # 2. High-frequency fixture sync (asyncio.as_completed): drain workers as they finish rather than waiting on the slowest date first
+                cycle_hashes: Dict[str, str] = {}
+                cycle_validators: Dict[str, Optional[Dict[str, str]]] = {}
+                cycle_settled: Set[str] = set()
+                # Each worker is capped so one hung connection cannot hold the cycle open
+                date_workers = [
+                    asyncio.wait_for(worker_process_date(session, date), timeout=DATE_FETCH_TIMEOUT_SECONDS)
+                    for date in due_dates
+                ]
+                for next_done in asyncio.as_completed(date_workers):
+                    try:
+                        date_str, fixtures, response_hash, validators, is_settled = await next_done
+                    except ApiAccessDenied as e:
+                        logging.warning(f"[Async Worker] Fixture fetch skipped: {e}")
+                        continue
+                    except asyncio.TimeoutError:
+                        logging.error(f"[Async Worker] A date fetch exceeded {DATE_FETCH_TIMEOUT_SECONDS}s and was cancelled.")
+                        continue
+                    except Exception as e:
+                        logging.error(f"[Async Worker] Exception during fixture sync: {e}")
+                        continue
+                    if fixtures:
+                        cycle_fixtures.extend(fixtures)
+                        cycle_hashes[date_str] = response_hash
+                        cycle_validators[date_str] = validators
+                        if is_settled:
+                            cycle_settled.add(date_str)
             
-            for result in results:
-                if isinstance(result, Exception):
-                    logging.error(f"[Async Worker] Exception during fixture sync: {result}")
-                else:
-                    all_updated_ids.update(result)
+                # One upsert and one commit for every changed date in this cycle
+                if cycle_fixtures:
+                    # On a worker thread: the event loop keeps serving enrichment while the upsert runs
+                    try:
+                        stored_ok, all_updated_ids = await asyncio.to_thread(store_fixtures, cycle_fixtures)
+                    except Exception as e:
+                        logging.error(f"[DB] Fixture store raised: {e}")
+                        stored_ok, all_updated_ids = False, set()
+                    # Only remember committed payloads; a commit may still yield no predictable fixtures.
+                    # Unstored payloads keep the previous validators, so the next poll fetches them in full.
+                    if stored_ok:
+                        LAST_RESPONSE_HASH.update(cycle_hashes)
+                        adopt_validators(cycle_validators)
+                        # A date is polled less often only once its final results are committed
+                        SETTLED_DATES.difference_update(cycle_hashes)
+                        SETTLED_DATES.update(cycle_settled)
+                        save_sync_state([date.isoformat() for date in dates_to_sync])
+                    else:
+                        if stored_ok is None:
+                            logging.info("[Sync] Fixture upsert deferred to the instance holding the lock; retrying next cycle.")
+                        # Unstored dates keep the full polling rate until they are written
+                        SETTLED_DATES.difference_update(cycle_hashes)
             
-            logging.info(f"Total unique fixtures updated/checked for prediction: {len(all_updated_ids)}")
+                logging.info(f"Total unique fixtures updated/checked for prediction: {len(all_updated_ids)}")
             
-            # 2. Trigger Prediction on the relevant fixture IDs (Sync subprocess call)
-            if all_updated_ids:
-                # Running sync subprocess inside async is fine, but ensures it finishes before moving on
+                # 3. Trigger Prediction on the relevant fixture IDs (in-process, on the predictor thread)
+                # Queued to the predictor worker thread; the loop does not wait for it.
+                # Called even with no new IDs so fixtures from a failed run are retried.
                 trigger_predictor(all_updated_ids)
 
-            # 3. Check and Run Low-Frequency Enrichment (Sequential async call)
-            current_time = dt.datetime.now(tz=UTC)
-            if (current_time - last_enrichment_check).total_seconds() >= ENRICHMENT_CHECK_INTERVAL_SECONDS:
-                logging.info("[MainThread] Starting low-frequency enrichment check.")
-                await run_enrichment_cycle()
-                last_enrichment_check = current_time # Reset check timer
-
-        except Exception as e:
-            logging.error(f"[Sync] Critical error in main loop: {e}")
+            except Exception as e:
+                logging.error(f"[Sync] Critical error in main loop: {e}")
+            
+            if enrichment_task is not None:
+                try:
+                    await enrichment_task
+                except Exception as e:
+                    logging.error(f"[Enrichment] Enrichment cycle failed: {e}")
         
-        cycle_end_time = time.time()
-        elapsed = cycle_end_time - cycle_start_time
+            cycle_end_time = time.monotonic()
+            elapsed = cycle_end_time - cycle_start_time
         
-        sleep_duration = SYNC_INTERVAL_SECONDS - elapsed
-        if sleep_duration < 0:
-            sleep_duration = 0
+            recent_activity.append(len(cycle_fixtures))
+            interval = SYNC_INTERVAL_SECONDS
+            if len(recent_activity) == recent_activity.maxlen and not any(recent_activity):
+                # Nothing changed for a whole window (e.g. overnight): poll less often until fixtures move again
+                interval *= IDLE_INTERVAL_MULTIPLIER
             
-        logging.info(f"Cycle finished in {elapsed:.2f}s. Sleeping for {sleep_duration:.2f}s...")
-        await asyncio.sleep(sleep_duration)
+            next_tick += interval
+            if next_tick < cycle_end_time:
+                missed = int((cycle_end_time - next_tick) // interval) + 1
+                logging.warning(f"Cycle overran its slot; skipping {missed} missed tick(s).")
+                next_tick += missed * interval
+            sleep_duration = next_tick - cycle_end_time
+            
+            logging.info(f"Cycle finished in {elapsed:.2f}s. Sleeping for {sleep_duration:.2f}s...")
+            await asyncio.sleep(sleep_duration)
+    finally:
+        await session.close()
 
 
 def main():
+    log_listener = start_queue_logging()
     logging.info(f"--- Sync (Enricher) v4.14 Starting (Interval: {SYNC_INTERVAL_SECONDS / 60} min) ---")
     if not AS_API_KEY:
         logging.error("FATAL: AS_API_KEY not set. Sync script cannot run.")
+        log_listener.stop()
         sys.exit(1)
         
-    # 1. Load priority IDs from mapping file
+    # 1. Load priority IDs from mapping file, and the last run's per-date sync state
     load_priority_league_ids()
+    load_sync_state()
         
     try:
-        # 2. Initialize DB Connection Pool
+        # 2. Size the predictor against the pool, then initialize the DB Connection Pool
+        check_pool_budget()
         db_utils.init_connection_pool()
         
         # 3. CRITICAL: Initialize or confirm PRIORITY status for mapped leagues
@@ -904,7 +1368,11 @@ def main():
     except KeyboardInterrupt:
         logging.info("--- SYNC POLLER STOPPING (KeyboardInterrupt) ---")
     finally:
+        # Let an in-flight predictor run finish before its pool is closed underneath it
+        PREDICTOR_STOPPING.set()
+        PREDICTOR_EXECUTOR.shutdown(wait=True, cancel_futures=True)
         db_utils.close_all_connections()
+        log_listener.stop() # Flushes any queued records
 
 
 if __name__ == "__main__":
@@ -17,6 +17,9 @@ LAGOS_TZ = pytz.timezone('Africa/Lagos')
 DEFAULT_DATE = "01-01-1900"
 DEFAULT_TIME = "00:00:00"
 
+# "Team1 Name Score1-Score2 Team2 Name" (non-greedy names), compiled once for get_structured_match_info
+MATCH_RESULT_RE = re.compile(r"(.+?)\s*(\d+)-(\d+)\s*(.+)")
+
 def parse_utc_to_gmt1(utc_date_input: Any) -> Tuple[str, str]:
     """
     Parses a UTC ISO date string OR a datetime object
@@ -84,7 +87,7 @@ def get_structured_match_info(match_data: Dict[str, Any], target_team_name: str)
     """
     result = match_data.get("result", "")
     # Pattern: Team1 Name Score1-Score2 Team2 Name (using non-greedy matching for names)
-    match = re.match(r"(.+?)\s*(\d+)-(\d+)\s*(.+)", result) 
+    match = MATCH_RESULT_RE.match(result)
 
     info = {
         "team1_name": "?",